@@ -0,0 +1,105 @@
+"""Bulk application status updates.
+
+The applications to update are loaded once (id, job and current status) and
+then moved to the new status with one `update_many` per previous status and
+chunk of ids. Every update is conditional on the status it was read with,
+so the job counters stay exact even when another request changes some of
+the same applications in between; those are reported as conflicts.
+"""
+from collections import Counter
+from datetime import datetime
+
+from bson import ObjectId
+from decouple import config
+from fastapi import HTTPException
+
+import job_counters
+import resource_versions
+
+BULK_STATUS_MAX_APPLICATIONS = config("BULK_STATUS_MAX_APPLICATIONS", default=10000, cast=int)
+CHUNK_SIZE = 1000
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def update_statuses(db, recruiter_id, query, status, requested_ids=None):
+    """Move the recruiter's applications matching `query` to `status`.
+
+    With `requested_ids`, results follow the request and ids that did not
+    match are not_found. Returns the response body.
+    """
+    applications = await db.applications.find(
+        {**query, "recruiter_id": recruiter_id}, {"job_id": 1, "status": 1, "candidate_id": 1}
+    ).limit(BULK_STATUS_MAX_APPLICATIONS + 1).to_list(length=None)
+    if len(applications) > BULK_STATUS_MAX_APPLICATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_STATUS_MAX_APPLICATIONS} applications can be updated at once"
+        )
+
+    results = {}
+    by_status = {}
+    for application in applications:
+        if application.get("status") == status:
+            results[str(application["_id"])] = UNCHANGED
+        else:
+            by_status.setdefault(application.get("status"), []).append(application)
+
+    # One timestamp per call identifies our writes if some updates lose a race
+    now = datetime.utcnow()
+    changes = Counter()
+    candidates = set()
+    for previous, group in by_status.items():
+        for chunk in _chunks(group):
+            ids = [application["_id"] for application in chunk]
+            result = await db.applications.update_many(
+                {"_id": {"$in": ids}, "status": previous},
+                {"$set": {"status": status, "updated_at": now}}
+            )
+            updated = set(ids)
+            if result.modified_count < len(ids):
+                written = await db.applications.find(
+                    {"_id": {"$in": ids}, "status": status, "updated_at": now}, {"_id": 1}
+                ).to_list(length=None)
+                updated = {doc["_id"] for doc in written}
+            for application in chunk:
+                if application["_id"] in updated:
+                    results[str(application["_id"])] = UPDATED
+                    changes[(application["job_id"], previous)] += 1
+                    candidates.add(application.get("candidate_id"))
+                else:
+                    results[str(application["_id"])] = CONFLICT
+
+    if changes:
+        await job_counters.record_status_changes(db, changes, status)
+        await resource_versions.bump(
+            db, resource_versions.APPLICATIONS, resource_versions.recruiter(recruiter_id),
+            *map(resource_versions.candidate, candidates)
+        )
+
+    # Requested ids keep their order; ids that matched nothing are not_found
+    order = list(results)
+    if requested_ids is not None:
+        order = [str(ObjectId(id_)) if ObjectId.is_valid(id_) else id_ for id_ in requested_ids]
+    order = list(dict.fromkeys(order))
+    outcomes = [{"application_id": id_, "result": results.get(id_, NOT_FOUND)} for id_ in order]
+    totals = Counter(outcome["result"] for outcome in outcomes)
+    return {
+        "status": status,
+        "matched": len(applications),
+        **{outcome: totals[outcome] for outcome in (UPDATED, UNCHANGED, CONFLICT, NOT_FOUND)},
+        "results": outcomes,
+    }
+
+
+def object_ids(ids):
+    """ObjectIds for the valid ids; the others cannot match and end up not_found."""
+    return list(dict.fromkeys(ObjectId(application_id) for application_id in ids if ObjectId.is_valid(application_id)))
@@ -0,0 +1,55 @@
+import time
+
+from decouple import config
+
+from cache import LRUCache
+
+AUTH_CACHE_SIZE = config("AUTH_CACHE_SIZE", default=10000, cast=int)
+# Invalidated by invalidate_user() on every write to a user document
+AUTH_CACHE_TTL = config("AUTH_CACHE_TTL", default=30, cast=float)
+
+# Verified bearer token -> (email, exp). Tokens are checked against their own
+# expiry on every hit, so a cached token never outlives the JWT.
+tokens = LRUCache(AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+# Email -> user document without the password hash
+users = LRUCache(AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+def token_subject(token):
+    entry = tokens.get(token)
+    if entry is None:
+        return None
+    email, expires_at = entry
+    if expires_at is not None and expires_at <= time.time():
+        tokens.pop(token)
+        return None
+    return email
+
+
+def remember_token(token, email, expires_at=None):
+    tokens.set(token, (email, expires_at))
+
+
+def get_user(email):
+    user = users.get(email)
+    # Handlers get their own copy so they cannot mutate the cached document
+    return dict(user) if user is not None else None
+
+
+def remember_user(user):
+    users.set(user["email"], dict(user))
+
+
+def invalidate_user(*emails):
+    """Call after any write to a user document (profile, email, password, delete)."""
+    for email in emails:
+        users.pop(email)
+
+
+def clear():
+    tokens.clear()
+    users.clear()
+
+
+def stats():
+    return {"tokens": tokens.stats(), "users": users.stats()}
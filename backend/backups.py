@@ -0,0 +1,322 @@
+"""Streaming backups of the application collections.
+
+A backup is a directory under BACKUP_DIR holding, per collection, gzip
+compressed BSON chunk files (`<collection>.<n>.bson.gz`, at most
+BACKUP_CHUNK_DOCUMENTS documents each) and a `manifest.json` with the
+SHA-256 and document count of every chunk. Collections are exported in
+parallel, straight from their cursors, and progress is recorded on the
+backup's document in the `backups` collection.
+
+Incremental backups copy only documents created (by `_id`) or modified (by
+`updated_at`) since the previous backup started and point at it as their
+base; restoring one replays the chain from the last full backup. Deletions
+are not tracked by incremental backups, so a restore can bring back
+documents deleted after the last full backup. A restore makes every
+conditional-GET tag stale, so clients reload the restored data.
+
+    python backups.py create [--incremental]
+    python backups.py restore <backup_id> [--drop]
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+import bson
+from bson import ObjectId
+from decouple import config
+from pymongo import ReplaceOne
+
+import resource_versions
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = config("BACKUP_DIR", default="backups")
+BACKUP_CHUNK_DOCUMENTS = config("BACKUP_CHUNK_DOCUMENTS", default=50000, cast=int)
+BACKUP_PARALLELISM = config("BACKUP_PARALLELISM", default=3, cast=int)
+BACKUP_BATCH_SIZE = 1000
+# Incremental windows start this much before the previous backup to absorb
+# clock skew between API servers and in-flight writes
+WATERMARK_SLACK = timedelta(minutes=5)
+
+COLLECTIONS = ["users", "jobs", "applications", "system_settings", "security_settings"]
+
+
+class _HashingWriter:
+    """File wrapper hashing the bytes written through it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+class _ChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self._raw = open(path, "wb")
+        self._hashing = _HashingWriter(self._raw)
+        self._gzip = gzip.GzipFile(fileobj=self._hashing, mode="wb", compresslevel=6)
+        self.closed = False
+
+    def write(self, data):
+        self._gzip.write(data)
+
+    def close(self):
+        self.closed = True
+        self._gzip.close()
+        self._raw.close()
+        return {"sha256": self._hashing.sha256.hexdigest(), "bytes": self._hashing.size}
+
+    def abort(self):
+        """Release the file of a chunk that will not be completed."""
+        self.closed = True
+        try:
+            self._gzip.close()
+        finally:
+            self._raw.close()
+
+
+def _backup_path(backup_id):
+    return os.path.join(BACKUP_DIR, backup_id)
+
+
+async def _export_collection(db, backup, name, query, semaphore):
+    directory = _backup_path(backup["backup_id"])
+    files = []
+    documents = 0
+    writer = None
+    async with semaphore:
+        cursor = db[name].find(query).batch_size(BACKUP_BATCH_SIZE)
+        if not query:
+            # Incremental queries are unsorted: an _id sort could make the
+            # planner walk the whole _id index instead of the updated_at one
+            cursor = cursor.sort("_id", 1)
+        buffer = []
+        chunk_documents = 0
+
+        async def flush():
+            if buffer:
+                data = b"".join(buffer)
+                buffer.clear()
+                await asyncio.to_thread(writer.write, data)
+
+        async def close_chunk():
+            await flush()
+            info = await asyncio.to_thread(writer.close)
+            files.append({"file": os.path.basename(writer.path), "documents": chunk_documents, **info})
+
+        try:
+            async for doc in cursor:
+                if writer is None or chunk_documents >= BACKUP_CHUNK_DOCUMENTS:
+                    if writer is not None:
+                        await close_chunk()
+                    path = os.path.join(directory, f"{name}.{len(files):04d}.bson.gz")
+                    writer = await asyncio.to_thread(_ChunkWriter, path)
+                    chunk_documents = 0
+                buffer.append(bson.encode(doc))
+                chunk_documents += 1
+                documents += 1
+                if len(buffer) >= BACKUP_BATCH_SIZE:
+                    await flush()
+                    await db.backups.update_one(
+                        {"_id": backup["_id"]}, {"$set": {f"progress.{name}": documents}}
+                    )
+            if writer is not None:
+                await close_chunk()
+        except BaseException:
+            # Also on cancellation; closing is quick, so it is done inline
+            if writer is not None and not writer.closed:
+                writer.abort()
+            raise
+    await db.backups.update_one({"_id": backup["_id"]}, {"$set": {f"progress.{name}": documents}})
+    return {"documents": documents, "files": files}
+
+
+async def _previous_backup(db):
+    return await db.backups.find_one(
+        {"status": "completed", "started_at": {"$exists": True}}, sort=[("started_at", -1)]
+    )
+
+
+async def start_backup(db, created_by, incremental=False, collections=COLLECTIONS):
+    """Record a new backup and return its document; run it with run_backup()."""
+    now = datetime.utcnow()
+    base = await _previous_backup(db) if incremental else None
+    backup = {
+        "backup_id": f"backup_{now.strftime('%Y%m%d_%H%M%S')}_{ObjectId()}",
+        "created_at": now,
+        "created_by": created_by,
+        "status": "running",
+        "type": "manual",
+        "mode": "incremental" if base else "full",
+        "base_backup_id": base["backup_id"] if base else None,
+        "since": base["started_at"] - WATERMARK_SLACK if base else None,
+        "collections_backed_up": list(collections),
+        "progress": {name: 0 for name in collections},
+    }
+    result = await db.backups.insert_one(backup)
+    backup["_id"] = result.inserted_id
+    return backup
+
+
+async def run_backup(db, backup):
+    """Export the collections; returns False (and marks the backup failed) on error."""
+    started_at = datetime.utcnow()
+    directory = _backup_path(backup["backup_id"])
+    await db.backups.update_one({"_id": backup["_id"]}, {"$set": {"started_at": started_at}})
+    try:
+        await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+        query = {}
+        if backup["since"] is not None:
+            since = backup["since"]
+            query = {"$or": [{"_id": {"$gte": ObjectId.from_datetime(since)}}, {"updated_at": {"$gte": since}}]}
+        semaphore = asyncio.Semaphore(BACKUP_PARALLELISM)
+        names = backup["collections_backed_up"]
+        exports = [asyncio.ensure_future(_export_collection(db, backup, name, query, semaphore)) for name in names]
+        try:
+            results = await asyncio.gather(*exports)
+        except BaseException:
+            # Stop the other exports so none keeps writing into a failed backup
+            for export in exports:
+                export.cancel()
+            await asyncio.gather(*exports, return_exceptions=True)
+            raise
+        manifest = {
+            "backup_id": backup["backup_id"],
+            "mode": backup["mode"],
+            "base_backup_id": backup["base_backup_id"],
+            "since": backup["since"].isoformat() if backup["since"] else None,
+            "started_at": started_at.isoformat(),
+            "collections": dict(zip(names, results)),
+        }
+
+        def write_manifest():
+            with open(os.path.join(directory, "manifest.json"), "w") as target:
+                json.dump(manifest, target, indent=2)
+        await asyncio.to_thread(write_manifest)
+        await db.backups.update_one({"_id": backup["_id"]}, {"$set": {
+            "status": "completed",
+            "completed_at": datetime.utcnow(),
+            "path": directory,
+            "manifest": manifest["collections"],
+        }})
+    except asyncio.CancelledError:
+        # e.g. shutdown mid-backup; without this it would stay "running"
+        logger.warning("Backup %s cancelled", backup["backup_id"])
+        await _mark_failed(db, backup, "Cancelled")
+        raise
+    except Exception as exc:
+        logger.exception("Backup %s failed", backup["backup_id"])
+        await _mark_failed(db, backup, str(exc))
+        return False
+    return True
+
+
+async def _mark_failed(db, backup, error):
+    await db.backups.update_one({"_id": backup["_id"]}, {"$set": {
+        "status": "failed", "error": error, "completed_at": datetime.utcnow(),
+    }})
+
+
+def _load_manifest(backup_id):
+    with open(os.path.join(_backup_path(backup_id), "manifest.json")) as source:
+        return json.load(source)
+
+
+def _verify_chunk(path, expected_sha256):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as source:
+        while block := source.read(1024 * 1024):
+            sha256.update(block)
+    if sha256.hexdigest() != expected_sha256:
+        raise ValueError(f"Checksum mismatch for {path}")
+
+
+def _read_chunk(path, batch_size):
+    with gzip.open(path, "rb") as source:
+        batch = []
+        for doc in bson.decode_file_iter(source):
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+async def restore(db, backup_id, drop=False):
+    """Restore a backup, replaying its incremental chain from the last full one."""
+    chain = []
+    current = backup_id
+    while current:
+        manifest = await asyncio.to_thread(_load_manifest, current)
+        chain.append(manifest)
+        current = manifest["base_backup_id"]
+    chain.reverse()
+
+    # Verify every chunk before touching the database
+    for manifest in chain:
+        directory = _backup_path(manifest["backup_id"])
+        for export in manifest["collections"].values():
+            for chunk in export["files"]:
+                await asyncio.to_thread(_verify_chunk, os.path.join(directory, chunk["file"]), chunk["sha256"])
+
+    if drop:
+        for name in chain[0]["collections"]:
+            await db[name].delete_many({})
+
+    restored = {}
+    for manifest in chain:
+        directory = _backup_path(manifest["backup_id"])
+        for name, export in manifest["collections"].items():
+            for chunk in export["files"]:
+                batches = _read_chunk(os.path.join(directory, chunk["file"]), BACKUP_BATCH_SIZE)
+                while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                    await db[name].bulk_write(
+                        [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch], ordered=False
+                    )
+                    restored[name] = restored.get(name, 0) + len(batch)
+    await resource_versions.invalidate_all(db)
+    return restored
+
+
+async def _main(args):
+    from database import client, db
+
+    try:
+        if args.command == "create":
+            backup = await start_backup(db, "cli", incremental=args.incremental)
+            if not await run_backup(db, backup):
+                sys.exit(f"Backup {backup['backup_id']} failed")
+            print(f"{backup['mode'].capitalize()} backup written to {_backup_path(backup['backup_id'])}")
+        else:
+            restored = await restore(db, args.backup_id, drop=args.drop)
+            for name, count in restored.items():
+                print(f"{name}: {count} document(s) restored")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or restore RecruiterYu backups")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create")
+    create.add_argument("--incremental", action="store_true", help="only copy changes since the last backup")
+    restore_parser = commands.add_parser("restore")
+    restore_parser.add_argument("backup_id")
+    restore_parser.add_argument("--drop", action="store_true", help="empty the collections before restoring")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,85 @@
+"""Database round trips made by request authentication.
+
+Resolves the bearer tokens of a pool of users through `get_current_user` many
+times, once with the auth cache cleared before every call (the old behaviour:
+JWT decode plus a user lookup each time) and once with it warm, counting the
+`find` commands sent to MongoDB.
+
+Usage (from backend/, against a local mongod):
+    python -m benchmarks.bench_auth_cache --users 200 --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from pymongo import monitoring
+
+os.environ.setdefault("MONGO_DB_NAME", "recruiteryu_bench")
+
+
+class FindCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.finds = 0
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.finds += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Global listeners only apply to clients created afterwards, so register
+# before main (and database) create theirs.
+counter = FindCounter()
+monitoring.register(counter)
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+import auth_cache  # noqa: E402
+import main as app_main  # noqa: E402
+
+
+async def run(tokens, total, cold):
+    auth_cache.clear()
+    counter.finds = 0
+    start = time.perf_counter()
+    for i in range(total):
+        if cold:
+            auth_cache.clear()
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=tokens[i % len(tokens)])
+        await app_main.get_current_user(credentials)
+    return time.perf_counter() - start, counter.finds
+
+
+async def main(args):
+    db = app_main.db
+    await db.users.delete_many({"email": {"$regex": r"@authbench\.local$"}})
+    emails = [f"user{i}@authbench.local" for i in range(args.users)]
+    await db.users.insert_many([
+        {"email": email, "name": f"User {i}", "role": "candidate", "password": "x"}
+        for i, email in enumerate(emails)
+    ])
+    tokens = [app_main.create_access_token({"sub": email}) for email in emails]
+
+    uncached, uncached_finds = await run(tokens, args.requests, cold=True)
+    cached, cached_finds = await run(tokens, args.requests, cold=False)
+
+    print(f"users={args.users} requests={args.requests}")
+    print(f"no cache : {uncached:.2f}s  {uncached_finds / args.requests:.3f} finds/request")
+    print(f"cached   : {cached:.2f}s  {cached_finds / args.requests:.3f} finds/request")
+    print(f"cache stats: {auth_cache.stats()}")
+
+    await db.users.delete_many({"email": {"$regex": r"@authbench\.local$"}})
+    app_main.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
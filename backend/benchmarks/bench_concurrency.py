@@ -0,0 +1,86 @@
+"""Concurrent-request throughput: blocking pymongo vs the async data layer.
+
+Simulates the work of an authenticated request (user lookup by email plus an
+open-jobs listing) issued from many coroutines at once, first with the old
+synchronous client called inline and then through Motor.
+
+Usage (from backend/, against a local mongod):
+    python -m benchmarks.bench_concurrency --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+
+from pymongo import MongoClient
+
+from database import MONGO_URI, create_client
+
+BENCH_DB = "recruiteryu_bench"
+
+
+def seed(sync_db, users, jobs):
+    sync_db.users.drop()
+    sync_db.jobs.drop()
+    sync_db.users.insert_many([
+        {"email": f"user{i}@bench.local", "name": f"User {i}", "role": "candidate"}
+        for i in range(users)
+    ])
+    sync_db.jobs.insert_many([
+        {"title": f"Job {i}", "status": "open", "company_id": str(i % 50)}
+        for i in range(jobs)
+    ])
+
+
+async def run_blocking(sync_db, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request(i):
+        async with semaphore:
+            # Same shape as the old handlers: sync calls inside a coroutine
+            sync_db.users.find_one({"email": f"user{i % 1000}@bench.local"})
+            list(sync_db.jobs.find({"status": "open"}).limit(20))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def run_async(async_db, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request(i):
+        async with semaphore:
+            await async_db.users.find_one({"email": f"user{i % 1000}@bench.local"})
+            await async_db.jobs.find({"status": "open"}).limit(20).to_list(length=None)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(args):
+    sync_client = MongoClient(MONGO_URI)
+    sync_db = sync_client[BENCH_DB]
+    seed(sync_db, users=1000, jobs=500)
+
+    async_client = create_client(maxPoolSize=args.pool_size)
+    async_db = async_client[BENCH_DB]
+
+    blocking = await run_blocking(sync_db, args.requests, args.concurrency)
+    non_blocking = await run_async(async_db, args.requests, args.concurrency)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} pool={args.pool_size}")
+    print(f"blocking pymongo : {blocking:.2f}s  {args.requests / blocking:.0f} req/s")
+    print(f"async data layer : {non_blocking:.2f}s  {args.requests / non_blocking:.0f} req/s")
+
+    sync_client.drop_database(BENCH_DB)
+    sync_client.close()
+    async_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
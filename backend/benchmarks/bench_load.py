@@ -0,0 +1,306 @@
+"""End-to-end HTTP load test with a latency regression check.
+
+Drives the real FastAPI app in-process (httpx over ASGI, startup hooks
+included) against a local mongod. Virtual users run a weighted mix of
+candidate, recruiter and admin journeys, each starting with a login:
+
+    candidate: login, open jobs, job search, own applications, apply, profile
+    recruiter: login, stats, own jobs, review applicants, status update
+    admin:     login, platform stats, customers, candidates
+
+Latency is recorded per route template and reported as throughput plus
+p50/p95/p99. `--save-baseline` stores the results as JSON; `--baseline`
+compares a run against a stored one and exits with status 1 when a route's
+p95 (see --metric) grew by more than --threshold, or its error rate went
+above --max-error-rate.
+
+Data comes from generate_data.py (same seed, same data) in a separate
+database, MONGO_DB_NAME=recruiteryu_loadtest unless set otherwise.
+
+Usage (from backend/, against a local mongod):
+    python -m benchmarks.bench_load --seed-data --save-baseline benchmarks/load_baseline.json
+    python -m benchmarks.bench_load --baseline benchmarks/load_baseline.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+os.environ.setdefault("MONGO_DB_NAME", "recruiteryu_loadtest")
+
+import httpx  # noqa: E402
+from pymongo import MongoClient  # noqa: E402
+
+import generate_data  # noqa: E402
+import main as app_main  # noqa: E402
+import passwords  # noqa: E402
+from database import MONGO_DB_NAME, MONGO_URI  # noqa: E402
+
+ADMIN_EMAIL = f"loadtest-admin@{generate_data.EMAIL_DOMAIN}"
+SEARCH_TERMS = ["python", "react", "developer", "engineer", "data", "remote", "aws", "java"]
+STATUSES = ["approved", "rejected", "hired", "pending"]
+JOURNEY_WEIGHTS = {"candidate": 70, "recruiter": 25, "admin": 5}
+# Lists are requested paginated, as the frontend does
+PAGE = {"limit": 20}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.journey_failures = defaultdict(int)
+
+    async def call(self, client, route, path=None, expected=(200,), **kwargs):
+        """Send one request; `route` is "METHOD /template", `path` the concrete URL."""
+        method, template = route.split(" ", 1)
+        start = time.perf_counter()
+        response = await client.request(method, path or template, **kwargs)
+        self.latencies[route].append(time.perf_counter() - start)
+        if response.status_code not in expected:
+            self.errors[route] += 1
+            return None
+        return response.json()
+
+
+def items(body):
+    """Items of a list response, paginated ({"items": [...]}) or legacy (a plain list)."""
+    if isinstance(body, dict):
+        return body.get("items", [])
+    return body or []
+
+
+async def login(recorder, client, email):
+    body = await recorder.call(
+        client, "POST /api/auth/login",
+        json={"email": email, "password": generate_data.PASSWORD}
+    )
+    if body is None:
+        return None
+    return {"Authorization": f"Bearer {body['access_token']}"}
+
+
+async def candidate_journey(recorder, client, rng, args):
+    headers = await login(recorder, client, f"candidate{rng.randrange(args.candidates)}@{generate_data.EMAIL_DOMAIN}")
+    if headers is None:
+        return
+    jobs = await recorder.call(client, "GET /api/candidate/jobs", headers=headers, params=PAGE)
+    await recorder.call(
+        client, "GET /api/candidate/jobs/search", headers=headers, params={"q": rng.choice(SEARCH_TERMS)}
+    )
+    await recorder.call(client, "GET /api/candidate/applications", headers=headers, params=PAGE)
+    open_jobs = [job for job in items(jobs) if not job["has_applied"]]
+    if open_jobs and rng.random() < 0.5:
+        job_id = rng.choice(open_jobs)["_id"]
+        # 400 when a concurrent session of the same candidate applied first
+        await recorder.call(
+            client, "POST /api/candidate/apply/{job_id}", f"/api/candidate/apply/{job_id}",
+            expected=(200, 400), headers=headers
+        )
+    await recorder.call(client, "GET /api/candidate/profile", headers=headers)
+
+
+async def recruiter_journey(recorder, client, rng, args):
+    headers = await login(recorder, client, f"recruiter{rng.randrange(args.recruiters)}@{generate_data.EMAIL_DOMAIN}")
+    if headers is None:
+        return
+    await recorder.call(client, "GET /api/recruiter/stats", headers=headers)
+    jobs = await recorder.call(client, "GET /api/recruiter/jobs", headers=headers, params=PAGE)
+    with_applicants = [job for job in items(jobs) if job.get("total_applications")]
+    if not with_applicants:
+        return
+    job_id = rng.choice(with_applicants)["_id"]
+    applications = await recorder.call(
+        client, "GET /api/recruiter/applications/{job_id}", f"/api/recruiter/applications/{job_id}",
+        headers=headers
+    )
+    if applications:
+        application_id = rng.choice(applications)["_id"]
+        await recorder.call(
+            client, "PUT /api/recruiter/applications/{application_id}",
+            f"/api/recruiter/applications/{application_id}",
+            headers=headers, json={"status": rng.choice(STATUSES)}
+        )
+
+
+async def admin_journey(recorder, client, rng, args):
+    headers = await login(recorder, client, ADMIN_EMAIL)
+    if headers is None:
+        return
+    await recorder.call(client, "GET /api/admin/stats", headers=headers)
+    await recorder.call(client, "GET /api/admin/customers", headers=headers, params=PAGE)
+    await recorder.call(client, "GET /api/admin/candidates", headers=headers, params=PAGE)
+
+
+JOURNEYS = {"candidate": candidate_journey, "recruiter": recruiter_journey, "admin": admin_journey}
+
+
+async def virtual_user(number, recorder, client, args, deadline):
+    rng = random.Random(f"{args.seed}-{number}")
+    names = list(JOURNEY_WEIGHTS)
+    weights = list(JOURNEY_WEIGHTS.values())
+    while time.perf_counter() < deadline:
+        journey = rng.choices(names, weights=weights)[0]
+        try:
+            await JOURNEYS[journey](recorder, client, rng, args)
+        except Exception as exc:
+            # One broken journey is reported, it does not stop the whole run
+            recorder.journey_failures[journey] += 1
+            print(f"{journey} journey failed: {exc!r}", file=sys.stderr)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(recorder, elapsed, args):
+    routes = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        routes[route] = {
+            "count": len(samples),
+            "errors": recorder.errors[route],
+            "rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {
+            "users": args.users, "duration": args.duration, "seed": args.seed,
+            "recruiters": args.recruiters, "jobs": args.jobs,
+            "candidates": args.candidates, "applications": args.applications,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "journey_failures": dict(recorder.journey_failures),
+        "throughput_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def compare(results, baseline, args):
+    """Return the list of regressions against `baseline`."""
+    metric = f"{args.metric}_ms"
+    regressions = [
+        f"{journey} journey: {count} failure(s)" for journey, count in results["journey_failures"].items()
+    ]
+    for route, current in results["routes"].items():
+        if current["count"] and current["errors"] / current["count"] > args.max_error_rate:
+            regressions.append(f"{route}: error rate {current['errors'] / current['count']:.1%}")
+        previous = baseline["routes"].get(route)
+        if previous is None or min(previous["count"], current["count"]) < args.min_samples:
+            continue
+        # The absolute slack keeps sub-millisecond noise from failing the run
+        limit = previous[metric] * (1 + args.threshold) + args.slack_ms
+        if current[metric] > limit:
+            regressions.append(
+                f"{route}: {args.metric} {current[metric]:.1f}ms > {limit:.1f}ms (baseline {previous[metric]:.1f}ms)"
+            )
+    return regressions
+
+
+def print_report(results):
+    print(f"{results['requests']} requests in {results['elapsed_s']}s, "
+          f"{results['throughput_rps']} req/s, {results['errors']} error(s)")
+    for journey, count in results["journey_failures"].items():
+        print(f"{journey} journey failed {count} time(s)")
+    print(f"{'route':58} {'count':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for route, stats in results["routes"].items():
+        print(f"{route:58} {stats['count']:7d} {stats['rps']:8.1f} {stats['p50_ms']:8.1f} "
+              f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f} {stats['errors']:7d}")
+
+
+def seed_data(args):
+    subprocess.run([
+        sys.executable, "generate_data.py", "--drop", "--seed", str(args.seed),
+        "--recruiters", str(args.recruiters), "--jobs", str(args.jobs),
+        "--candidates", str(args.candidates), "--applications", str(args.applications),
+    ], check=True, env={**os.environ, "MONGO_DB_NAME": MONGO_DB_NAME})
+    client = MongoClient(MONGO_URI)
+    client[MONGO_DB_NAME].users.update_one({"email": ADMIN_EMAIL}, {"$setOnInsert": {
+        "name": "Load Test Admin",
+        "email": ADMIN_EMAIL,
+        "password": passwords.pwd_context.hash(generate_data.PASSWORD),
+        "role": "admin",
+        "company": None,
+        "created_at": datetime.utcnow(),
+        "is_active": True,
+    }}, upsert=True)
+    client.close()
+
+
+async def run(args):
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app_main.app)
+    # Runs the startup and shutdown hooks, as uvicorn would
+    async with app_main.app.router.lifespan_context(app_main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            if args.warmup:
+                warmup_deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*(
+                    virtual_user(-number - 1, Recorder(), client, args, warmup_deadline) for number in range(args.users)
+                ))
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(*(virtual_user(number, recorder, client, args, deadline) for number in range(args.users)))
+            elapsed = time.perf_counter() - start
+    return summarize(recorder, elapsed, args)
+
+
+def main(args):
+    if args.seed_data:
+        seed_data(args)
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as target:
+            json.dump(results, target, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as target:
+            json.dump(results, target, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as source:
+            regressions = compare(results, json.load(source), args)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No route regressed by more than {args.threshold:.0%} on {args.metric}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of unmeasured load first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-data", action="store_true", help="regenerate the data set with generate_data.py")
+    parser.add_argument("--recruiters", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--applications", type=int, default=100000)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--save-baseline", help="write the results as the new baseline")
+    parser.add_argument("--baseline", help="fail on regressions against this baseline")
+    parser.add_argument("--metric", choices=["p50", "p95", "p99"], default="p95")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative growth, 0.25 = 25%%")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="allowed absolute growth on top of the threshold")
+    parser.add_argument("--min-samples", type=int, default=20, help="routes with fewer samples are not compared")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    main(parser.parse_args())
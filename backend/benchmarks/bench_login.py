@@ -0,0 +1,62 @@
+"""Login throughput at several bcrypt cost factors.
+
+Runs a burst of concurrent password verifications through the bounded worker
+pool in passwords.py and reports verifications per second together with the
+worst event-loop stall seen while the burst was running.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --logins 200 --rounds 10 11 12 13
+"""
+import argparse
+import asyncio
+import time
+
+import passwords
+
+
+async def measure_loop_lag(stop, interval=0.005):
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - expected)
+    return worst
+
+
+async def run(rounds, logins):
+    hashed = passwords.pwd_context.handler("bcrypt").using(rounds=rounds).hash("password123")
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(passwords.verify_password("password123", hashed) for _ in range(logins)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await lag_task
+    rejected = sum(1 for r in results if isinstance(r, Exception))
+    return elapsed, worst_lag, rejected
+
+
+async def main(args):
+    print(f"workers={passwords.PASSWORD_WORKERS} queue_limit={passwords.PASSWORD_QUEUE_LIMIT}")
+    for rounds in args.rounds:
+        elapsed, worst_lag, rejected = await run(rounds, args.logins)
+        accepted = args.logins - rejected
+        print(
+            f"rounds={rounds:2d}  {accepted / elapsed:7.1f} logins/s  "
+            f"max loop stall {worst_lag * 1000:6.1f}ms  rejected={rejected}"
+        )
+    passwords.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""Latency of /api/recruiter/stats as a recruiter's application count grows.
+
+Seeds a throwaway database with one recruiter, a handful of jobs and an
+increasing number of applications, then times the aggregation-backed
+get_recruiter_stats handler against the previous approach of loading every
+application into Python.
+
+Usage (from backend/, against a local mongod):
+    python -m benchmarks.bench_recruiter_stats --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGO_DB_NAME", "recruiteryu_bench")
+
+from bson import ObjectId  # noqa: E402
+
+import main  # noqa: E402
+from database import client, db  # noqa: E402
+
+STATUSES = ["pending", "approved", "rejected", "hired"]
+
+
+async def seed(recruiter_id, jobs, applications):
+    await db.jobs.delete_many({})
+    await db.applications.delete_many({})
+    now = datetime.utcnow()
+    job_ids = [ObjectId() for _ in range(jobs)]
+    await db.jobs.insert_many([
+        {"_id": job_id, "title": f"Job {i}", "company_id": recruiter_id,
+         "created_at": now - timedelta(days=60), "status": "open"}
+        for i, job_id in enumerate(job_ids)
+    ])
+    rng = random.Random(42)
+    batch = []
+    for i in range(applications):
+        applied_at = now - timedelta(days=rng.randint(1, 50))
+        batch.append({
+            "job_id": str(rng.choice(job_ids)),
+            "candidate_id": str(ObjectId()),
+            "recruiter_id": recruiter_id,
+            "status": rng.choice(STATUSES),
+            "applied_at": applied_at,
+            "updated_at": applied_at + timedelta(days=rng.randint(0, 20)),
+        })
+        if len(batch) == 10000:
+            await db.applications.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db.applications.insert_many(batch, ordered=False)
+
+
+async def legacy_stats(recruiter_id):
+    jobs = await db.jobs.find({"company_id": recruiter_id}).to_list(length=None)
+    job_ids = [str(job["_id"]) for job in jobs]
+    applications = await db.applications.find({"job_id": {"$in": job_ids}}).to_list(length=None)
+    return len([app for app in applications if app["status"] == "approved"])
+
+
+async def timed(coro_fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def run(args):
+    recruiter = {"_id": ObjectId(), "role": "recruiter"}
+    recruiter_id = str(recruiter["_id"])
+    await main.ensure_indexes(db)
+    print(f"{'applications':>12}  {'aggregation':>12}  {'python-side':>12}")
+    for size in args.sizes:
+        await seed(recruiter_id, args.jobs, size)
+        aggregated = await timed(lambda: main.get_recruiter_stats(recruiter), args.repeat)
+        legacy = await timed(lambda: legacy_stats(recruiter_id), args.repeat)
+        print(f"{size:>12}  {aggregated * 1000:>10.1f}ms  {legacy * 1000:>10.1f}ms")
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--jobs", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
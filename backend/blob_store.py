@@ -0,0 +1,306 @@
+"""Content-addressed storage for uploaded files.
+
+Uploads are streamed in chunks, hashed while streaming and stored under
+`<sha256>.<ext>`, so identical files are kept once. The backend is chosen
+with BLOB_STORE:
+
+    local   files in UPLOAD_DIR (default; one node, or a shared volume)
+    gridfs  the `uploads` GridFS bucket of the application database, shared
+            by every API node
+
+Run this module directly to move pictures stored under the old mutable
+`<user id>_profile.<ext>` names to content-addressed keys:
+
+    python blob_store.py
+"""
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import re
+import tempfile
+from datetime import datetime
+
+from decouple import config
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+BLOB_STORE = config("BLOB_STORE", default="local")
+UPLOAD_DIR = config("UPLOAD_DIR", default="uploads")
+MAX_UPLOAD_BYTES = config("MAX_UPLOAD_BYTES", default=5 * 1024 * 1024, cast=int)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+# Ingested uploads stay in memory up to this size, then spill to a temp file
+SPOOL_MAX_BYTES = 1024 * 1024
+
+# Only stored keys are served; this also rules out path traversal
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.[a-z0-9]+$")
+# Content-addressed keys never change meaning; older uploads used mutable names
+HASHED_KEY = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+
+# Types also stored gzip-compressed under "<key>.gz"
+PRECOMPRESSED_EXTENSIONS = ("svg",)
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+}
+
+
+def sniff_extension(head):
+    """Image type from the leading bytes; the client's filename is not trusted."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+        return "svg"
+    return None
+
+
+def content_type(key):
+    return CONTENT_TYPES.get(key.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+def is_immutable(key):
+    return HASHED_KEY.match(key) is not None
+
+
+def gzip_key(key):
+    return f"{key}.gz"
+
+
+class Blob:
+    """A stored file: its size, a strong ETag and ranged async reads."""
+
+    def __init__(self, key, size, etag, reader):
+        self.key = key
+        self.size = size
+        self.etag = etag
+        self._reader = reader
+
+    def chunks(self, start=0, end=None):
+        """Async iterator over bytes [start, end) of the file."""
+        return self._reader(start, self.size if end is None else end)
+
+
+def _hashed_etag(key, fallback):
+    match = HASHED_KEY.match(key.removesuffix(".gz"))
+    if match is None:
+        return fallback
+    return f'"{match.group(1)}-gz"' if key.endswith(".gz") else f'"{match.group(1)}"'
+
+
+class LocalBlobStore:
+    def __init__(self, directory=UPLOAD_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    async def exists(self, key):
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+    async def put(self, key, source):
+        def write():
+            # Write next to the target and rename, so readers never see a
+            # partial file and concurrent identical uploads are harmless
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".upload-")
+            try:
+                with os.fdopen(fd, "wb") as target:
+                    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                        target.write(chunk)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        await asyncio.to_thread(write)
+
+    async def open(self, key):
+        path = self._path(key)
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+        except OSError:
+            return None
+
+        async def read(start, end):
+            with open(path, "rb") as source:
+                source.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = await asyncio.to_thread(source.read, min(UPLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+        etag = _hashed_etag(key, f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"')
+        return Blob(key, stat.st_size, etag, read)
+
+    async def delete(self, key):
+        try:
+            await asyncio.to_thread(os.unlink, self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class GridFSBlobStore:
+    def __init__(self, db, bucket_name="uploads"):
+        self.files = db[f"{bucket_name}.files"]
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=255 * 1024)
+
+    async def exists(self, key):
+        return await self.files.find_one({"filename": key}, {"_id": 1}) is not None
+
+    async def put(self, key, source):
+        await self.bucket.upload_from_stream(key, source, metadata={"contentType": content_type(key)})
+
+    async def open(self, key):
+        doc = await self.files.find_one({"filename": key}, {"_id": 1, "length": 1})
+        if doc is None:
+            return None
+
+        async def read(start, end):
+            grid_out = await self.bucket.open_download_stream(doc["_id"])
+            grid_out.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = await grid_out.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        return Blob(key, doc["length"], _hashed_etag(key, f'"{doc["_id"]}"'), read)
+
+    async def delete(self, key):
+        async for doc in self.files.find({"filename": key}, {"_id": 1}):
+            await self.bucket.delete(doc["_id"])
+
+
+def create_store(db, kind=BLOB_STORE):
+    if kind == "local":
+        return LocalBlobStore()
+    if kind == "gridfs":
+        return GridFSBlobStore(db)
+    raise ValueError(f"Unknown BLOB_STORE {kind!r}")
+
+
+def _too_large(max_bytes):
+    return HTTPException(status_code=413, detail=f"File too large (max {max_bytes // 1024} KB)")
+
+
+async def _upload_chunks(upload):
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def ingest(store, upload, max_bytes=MAX_UPLOAD_BYTES):
+    """Stream an UploadFile into `store` and return its content-addressed key.
+
+    Raises 413 past `max_bytes` and 400 for anything that is not a supported
+    image. A file that is already stored is not written again.
+    """
+    return await ingest_chunks(store, _upload_chunks(upload), max_bytes)
+
+
+async def ingest_chunks(store, chunks, max_bytes=MAX_UPLOAD_BYTES):
+    digest = hashlib.sha256()
+    size = 0
+    extension = None
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        async for chunk in chunks:
+            if extension is None:
+                extension = sniff_extension(chunk)
+                if extension is None:
+                    raise HTTPException(status_code=400, detail="Unsupported image type")
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(spool.write, chunk)
+        if extension is None:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        key = f"{digest.hexdigest()}.{extension}"
+        if not await store.exists(key):
+            spool.seek(0)
+            await store.put(key, spool)
+            if extension in PRECOMPRESSED_EXTENSIONS:
+                spool.seek(0)
+                compressed = await asyncio.to_thread(gzip.compress, spool.read(), 9)
+                await store.put(gzip_key(key), io.BytesIO(compressed))
+    return key
+
+
+class UploadSizeLimit:
+    """ASGI middleware rejecting uploads to `paths` on their Content-Length.
+
+    FastAPI reads the whole multipart body before a handler or its
+    dependencies run, so the streaming check in `ingest` only fires once the
+    upload has been received. Chunked requests carry no length and fall
+    through to that check.
+    """
+
+    def __init__(self, app, paths, max_bytes=MAX_UPLOAD_BYTES):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            length = dict(scope["headers"]).get(b"content-length", b"")
+            if length.isdigit() and int(length) > self.max_bytes + MULTIPART_OVERHEAD_BYTES:
+                error = _too_large(self.max_bytes)
+                response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def migrate_legacy_pictures(db, store):
+    """Re-store pictures saved under mutable names and point profiles at the
+    content-addressed URL, so they can be served as immutable."""
+    migrated = 0
+    async for user in db.users.find({"profile.profile_picture": {"$regex": "^/uploads/"}}, {"profile.profile_picture": 1}):
+        old_key = user["profile"]["profile_picture"].removeprefix("/uploads/")
+        if is_immutable(old_key):
+            continue
+        blob = await store.open(old_key)
+        if blob is None:
+            continue
+        try:
+            key = await ingest_chunks(store, blob.chunks(), max_bytes=blob.size)
+        except HTTPException:
+            continue
+        # Only the stored URL changes; profile_completion is unaffected
+        await db.users.update_one(
+            {"_id": user["_id"], "profile.profile_picture": f"/uploads/{old_key}"},
+            {"$set": {"profile.profile_picture": f"/uploads/{key}", "updated_at": datetime.utcnow()}}
+        )
+        migrated += 1
+    return migrated
+
+
+async def _main():
+    from database import client, db
+
+    try:
+        migrated = await migrate_legacy_pictures(db, create_store(db))
+        print(f"Moved {migrated} profile picture(s) to content-addressed URLs")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
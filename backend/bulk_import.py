@@ -0,0 +1,172 @@
+"""Streaming bulk import of NDJSON or CSV uploads.
+
+Rows are read from the uploaded file in batches of IMPORT_BATCH_SIZE,
+validated one by one and written with unordered `insert_many`, so memory
+use depends on the batch size rather than the file size. Failed rows (bad
+JSON, validation errors, duplicate keys) are reported by 1-based row number;
+the report keeps the first IMPORT_MAX_ERRORS of them.
+
+In CSV files, list fields may hold a JSON array or `;`-separated values.
+"""
+import csv
+import io
+import json
+
+from decouple import config
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
+
+IMPORT_BATCH_SIZE = config("IMPORT_BATCH_SIZE", default=1000, cast=int)
+IMPORT_MAX_ERRORS = config("IMPORT_MAX_ERRORS", default=1000, cast=int)
+
+FORMATS = ("ndjson", "csv")
+
+
+def detect_format(filename, requested=None):
+    fmt = requested or ("csv" if (filename or "").lower().endswith(".csv") else "ndjson")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+    return fmt
+
+
+class RowError(Exception):
+    pass
+
+
+def _csv_value(value):
+    value = value.strip()
+    if value == "":
+        return None
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise RowError("Invalid JSON list")
+    return value
+
+
+def _csv_row(row, list_fields):
+    record = {}
+    for key, value in row.items():
+        if key is None:
+            raise RowError("Too many columns")
+        value = _csv_value(value or "")
+        if key in list_fields and isinstance(value, str):
+            value = [part.strip() for part in value.split(";") if part.strip()]
+        if value is not None:
+            record[key.strip()] = value
+    return record
+
+
+def _ndjson_row(line):
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise RowError("Invalid JSON")
+    if not isinstance(record, dict):
+        raise RowError("Each line must be a JSON object")
+    return record
+
+
+def _reader(upload, fmt, list_fields):
+    """Yield (row number, record or RowError) from the upload's file."""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(text), start=1):
+                try:
+                    yield number, _csv_row(row, list_fields)
+                except RowError as exc:
+                    yield number, exc
+        else:
+            number = 0
+            for line in text:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    yield number, _ndjson_row(line)
+                except RowError as exc:
+                    yield number, exc
+    finally:
+        # Leave the upload's file open for Starlette to close
+        text.detach()
+
+
+def _next_batch(rows, size):
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= size:
+            break
+    return batch
+
+
+def _format_error(exc):
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+        )
+    return str(exc)
+
+
+class ImportReport:
+    def __init__(self, max_errors=IMPORT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": message})
+
+    def response(self):
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def import_rows(upload, fmt, collection, build, list_fields=(), batch_size=IMPORT_BATCH_SIZE, on_batch=None):
+    """Import every row of `upload` into `collection`.
+
+    `build(record)` validates a row and returns the document to insert;
+    `on_batch(inserted_count)` runs after each written batch.
+    """
+    report = ImportReport()
+    rows = _reader(upload, fmt, set(list_fields))
+    await upload.seek(0)
+    while batch := await run_in_threadpool(_next_batch, rows, batch_size):
+        documents, row_numbers = [], []
+        for number, record in batch:
+            if isinstance(record, RowError):
+                report.error(number, str(record))
+                continue
+            try:
+                documents.append(build(record))
+                row_numbers.append(number)
+            except (ValidationError, ValueError, TypeError) as exc:
+                report.error(number, _format_error(exc))
+        if not documents:
+            continue
+        inserted = len(documents)
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            for write_error in exc.details.get("writeErrors", []):
+                if write_error.get("code") == 11000:
+                    message = f"Already exists: {json.dumps(write_error.get('keyValue'), default=str)}"
+                else:
+                    message = write_error.get("errmsg", "Write failed")
+                report.error(row_numbers[write_error["index"]], message)
+            inserted = exc.details.get("nInserted", 0)
+        report.inserted += inserted
+        if on_batch is not None and inserted:
+            await on_batch(inserted)
+    return report.response()
@@ -0,0 +1,36 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from decouple import config
+
+import metrics
+
+# MongoDB connection settings (overridable through environment / .env)
+MONGO_URI = config("MONGO_URI", default="mongodb://localhost:27017/")
+MONGO_DB_NAME = config("MONGO_DB_NAME", default="recruiteryu")
+MONGO_MAX_POOL_SIZE = config("MONGO_MAX_POOL_SIZE", default=100, cast=int)
+MONGO_MIN_POOL_SIZE = config("MONGO_MIN_POOL_SIZE", default=0, cast=int)
+MONGO_SERVER_SELECTION_TIMEOUT_MS = config("MONGO_SERVER_SELECTION_TIMEOUT_MS", default=5000, cast=int)
+MONGO_CONNECT_TIMEOUT_MS = config("MONGO_CONNECT_TIMEOUT_MS", default=5000, cast=int)
+MONGO_SOCKET_TIMEOUT_MS = config("MONGO_SOCKET_TIMEOUT_MS", default=20000, cast=int)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = config("MONGO_WAIT_QUEUE_TIMEOUT_MS", default=10000, cast=int)
+
+
+def create_client(uri=MONGO_URI, **overrides):
+    """Create an async MongoDB client using the configured pool size and timeouts."""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        # Per-request command counts and pool usage for /metrics
+        "event_listeners": metrics.listeners,
+    }
+    options.update(overrides)
+    return AsyncIOMotorClient(uri, **options)
+
+
+# Shared client for the API process. Motor binds to the running event loop on
+# first use, so creating it at import time is safe.
+client = create_client()
+db = client[MONGO_DB_NAME]
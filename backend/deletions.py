@@ -0,0 +1,209 @@
+"""Background cascade deletion.
+
+Deleting a user or a job marks it with `deleted_at` straight away (reads
+filter on ACTIVE) and records a job in `deletion_jobs`. A worker task then
+removes the dependent applications, jobs and finally the owner document in
+bounded batches, pausing between batches to spread the write load.
+
+Every step re-queries what is left to delete, so a job interrupted by a
+crash simply continues where it stopped: workers hold a lease on the job
+they are running and any worker picks up jobs whose lease has expired.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from decouple import config
+from pymongo import ReturnDocument
+
+import job_counters
+import platform_stats
+import resource_versions
+
+logger = logging.getLogger(__name__)
+
+DELETION_BATCH_SIZE = config("DELETION_BATCH_SIZE", default=500, cast=int)
+# Pause between batches, in seconds
+DELETION_BATCH_PAUSE = config("DELETION_BATCH_PAUSE", default=0.05, cast=float)
+DELETION_POLL_SECONDS = config("DELETION_POLL_SECONDS", default=30, cast=int)
+DELETION_MAX_ATTEMPTS = config("DELETION_MAX_ATTEMPTS", default=5, cast=int)
+LEASE_SECONDS = 60
+
+# Query filter for documents that are not soft-deleted
+ACTIVE = {"deleted_at": None}
+
+_wake = asyncio.Event()
+
+
+async def soft_delete_user(db, user_id, role=None):
+    """Hide a user (and a recruiter's jobs) and return the user, or None."""
+    query = {"_id": ObjectId(user_id), **ACTIVE}
+    if role:
+        query["role"] = role
+    now = datetime.utcnow()
+    # updated_at too, so incremental backups capture the soft delete
+    user = await db.users.find_one_and_update(
+        query, {"$set": {"deleted_at": now, "updated_at": now}}, {"role": 1, "email": 1}
+    )
+    if user is None:
+        return None
+    jobs_hidden = 0
+    if user.get("role") == "recruiter":
+        result = await db.jobs.update_many(
+            {"company_id": user_id, **ACTIVE}, {"$set": {"deleted_at": now, "updated_at": now}}
+        )
+        jobs_hidden = result.modified_count
+    # Platform counters exclude soft-deleted users and jobs (see reconcile)
+    await platform_stats.bump(db, role=user.get("role"), users=-1, jobs=-jobs_hidden)
+    return user
+
+
+async def soft_delete_job(db, job_id, company_id):
+    """Hide a recruiter's job; returns False when there is no such job."""
+    now = datetime.utcnow()
+    result = await db.jobs.update_one(
+        {"_id": ObjectId(job_id), "company_id": company_id, **ACTIVE},
+        {"$set": {"deleted_at": now, "updated_at": now}}
+    )
+    if result.modified_count == 0:
+        return False
+    await platform_stats.bump(db, jobs=-1)
+    return True
+
+
+async def hidden_user_ids(db):
+    """Ids of soft-deleted users the cascade has not removed yet; there are few at any time."""
+    users = await db.users.find({"deleted_at": {"$type": "date"}}, {"_id": 1}).to_list(length=None)
+    return [str(user["_id"]) for user in users]
+
+
+async def enqueue(db, kind, target_id, requested_by):
+    now = datetime.utcnow()
+    job = {
+        "kind": kind,
+        "target_id": target_id,
+        "requested_by": requested_by,
+        "status": "pending",
+        "deleted": {"applications": 0, "jobs": 0, "users": 0},
+        "attempts": 0,
+        "error": None,
+        "lease_until": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    result = await db.deletion_jobs.insert_one(job)
+    _wake.set()
+    return str(result.inserted_id)
+
+
+async def get_job(db, job_id):
+    if not ObjectId.is_valid(job_id):
+        return None
+    return await db.deletion_jobs.find_one({"_id": ObjectId(job_id)}, {"lease_until": 0})
+
+
+async def _steps(db, job):
+    """(collection, query) pairs, deleted in order."""
+    target_id = job["target_id"]
+    if job["kind"] == "job":
+        return [
+            ("applications", {"job_id": target_id}),
+            ("jobs", {"_id": ObjectId(target_id)}),
+        ]
+    # Applications for a recruiter's jobs may predate the recruiter_id field
+    jobs = await db.jobs.find({"company_id": target_id}, {"_id": 1}).to_list(length=None)
+    job_ids = [str(owned["_id"]) for owned in jobs]
+    return [
+        ("applications", {"$or": [
+            {"candidate_id": target_id}, {"recruiter_id": target_id}, {"job_id": {"$in": job_ids}}
+        ]}),
+        ("jobs", {"company_id": target_id}),
+        ("users", {"_id": ObjectId(target_id)}),
+    ]
+
+
+def _owner_scopes(collection, batch):
+    """Resource version scopes whose views change when `batch` is deleted."""
+    if collection == "applications":
+        return [
+            scope for doc in batch for scope in (
+                resource_versions.recruiter(doc.get("recruiter_id")), resource_versions.candidate(doc.get("candidate_id"))
+            )
+        ]
+    if collection == "jobs":
+        return [resource_versions.recruiter(doc.get("company_id")) for doc in batch]
+    return [scope for doc in batch for scope in resource_versions.account(str(doc["_id"]))]
+
+
+async def _delete_in_batches(db, job, collection, query):
+    owners = {"_id": 1, "recruiter_id": 1, "candidate_id": 1, "company_id": 1}
+    while True:
+        batch = await db[collection].find(query, owners).limit(DELETION_BATCH_SIZE).to_list(length=None)
+        if not batch:
+            return
+        ids = {"_id": {"$in": [doc["_id"] for doc in batch]}}
+        if collection == "applications":
+            await job_counters.release_applications(db, ids)
+        result = await db[collection].delete_many(ids)
+        if collection == "applications":
+            await platform_stats.bump(db, applications=-result.deleted_count)
+        # Per batch, after counters and documents changed, so cached views of
+        # the affected recruiters and candidates revalidate (also on resume)
+        await resource_versions.bump(db, collection, *_owner_scopes(collection, batch))
+        await db.deletion_jobs.update_one({"_id": job["_id"]}, {
+            "$inc": {f"deleted.{collection}": result.deleted_count},
+            "$set": {"updated_at": datetime.utcnow(), "lease_until": datetime.utcnow() + timedelta(seconds=LEASE_SECONDS)},
+        })
+        await asyncio.sleep(DELETION_BATCH_PAUSE)
+
+
+async def run_job(db, job):
+    for collection, query in await _steps(db, job):
+        await _delete_in_batches(db, job, collection, query)
+    await db.deletion_jobs.update_one(
+        {"_id": job["_id"]},
+        {"$set": {"status": "completed", "error": None, "lease_until": None, "updated_at": datetime.utcnow()}}
+    )
+    await resource_versions.bump(db, resource_versions.USERS, resource_versions.JOBS, resource_versions.APPLICATIONS)
+
+
+async def claim(db):
+    """Lease the oldest unfinished job nobody else is running."""
+    now = datetime.utcnow()
+    return await db.deletion_jobs.find_one_and_update(
+        {"status": {"$in": ["pending", "running"]}, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+        {"$set": {"status": "running", "lease_until": now + timedelta(seconds=LEASE_SECONDS), "updated_at": now}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def run_worker(db, interval=DELETION_POLL_SECONDS):
+    while True:
+        _wake.clear()
+        try:
+            while (job := await claim(db)) is not None:
+                try:
+                    await run_job(db, job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.exception("Deletion job %s failed", job["_id"])
+                    attempts = job.get("attempts", 0) + 1
+                    await db.deletion_jobs.update_one({"_id": job["_id"]}, {"$set": {
+                        "status": "failed" if attempts >= DELETION_MAX_ATTEMPTS else "running",
+                        "attempts": attempts,
+                        "error": str(exc),
+                        # Back off before another worker retries it
+                        "lease_until": datetime.utcnow() + timedelta(seconds=interval * attempts),
+                        "updated_at": datetime.utcnow(),
+                    }})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Deletion worker failed to claim a job")
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
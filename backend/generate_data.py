@@ -0,0 +1,320 @@
+"""Seeded synthetic data for load and capacity testing.
+
+Generates recruiters, jobs, candidates with profiles and applications at
+any scale. Output depends only on the seed and the requested counts (not on
+the number of workers): every document, including its `_id`, is derived
+from a random generator seeded per batch. Distributions are skewed the way
+real traffic is: a few recruiters post most jobs, a few jobs draw most
+applications and the number of applications per candidate is long-tailed.
+
+Batches are written with unordered insert_many from parallel worker
+processes. All accounts share one bcrypt hash, computed once, for the
+password "password123". Job counters, profile completion, platform stats
+and indexes are brought up to date at the end.
+
+Usage (from backend/):
+    python generate_data.py --drop
+    python generate_data.py --drop --candidates 1000000 --jobs 100000 \\
+        --applications 20000000 --workers 8
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import multiprocessing
+import random
+import struct
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+from database import MONGO_DB_NAME, MONGO_URI
+from profiles import profile_completion
+
+PASSWORD = "password123"
+# A real-looking domain: EmailStr rejects special-use ones such as .test,
+# which would keep generated accounts from logging in
+EMAIL_DOMAIN = "example.com"
+START = datetime(2023, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+# Most applications one candidate can have
+MAX_APPLICATIONS_PER_CANDIDATE = 200
+
+# One tag byte per kind keeps generated ObjectIds unique across collections
+KIND_TAGS = {"recruiter": 1, "job": 2, "candidate": 3, "application": 4}
+
+FIRST_NAMES = ["Aisha", "Ben", "Carlos", "Dana", "Elif", "Farah", "George", "Hana", "Ivan", "Julia",
+               "Kenji", "Laila", "Mateo", "Nina", "Omar", "Priya", "Quinn", "Rosa", "Sami", "Tara"]
+LAST_NAMES = ["Ahmed", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Khan", "Lopez", "Müller",
+              "Nguyen", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Usman", "Wang", "Yilmaz", "Zhou"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Cyberdyne", "Tyrell"]
+TITLES = ["Frontend Developer", "Backend Developer", "Full Stack Developer", "Data Engineer", "DevOps Engineer",
+          "Mobile Developer", "QA Engineer", "Machine Learning Engineer", "Product Designer", "Site Reliability Engineer"]
+# Ordered by popularity; sampled with Zipf weights
+SKILLS = ["JavaScript", "Python", "React", "SQL", "Node.js", "Java", "AWS", "Docker", "TypeScript", "MongoDB",
+          "Kubernetes", "Go", "Django", "FastAPI", "HTML", "CSS", "C#", "Rust", "Terraform", "GraphQL"]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "London", "Berlin", "Karachi", "Lahore",
+             "Toronto", "Singapore", "Dubai"]
+DEGREES = ["Bachelor's in Computer Science", "Master's in Software Engineering", "Bachelor's in Mathematics",
+           "Diploma in IT", "BSc Information Systems"]
+APPLICATION_STATUSES = ["pending", "approved", "rejected", "hired"]
+STATUS_WEIGHTS = [60, 20, 15, 5]
+
+
+def zipf_cum_weights(count, exponent=1.1):
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def object_id(kind, index, seconds):
+    """Deterministic ObjectId whose timestamp matches the document's creation time."""
+    timestamp = int((START - datetime(1970, 1, 1)).total_seconds()) + int(seconds)
+    return ObjectId(struct.pack(">IB", timestamp, KIND_TAGS[kind]) + index.to_bytes(7, "big"))
+
+
+def spread(index, count):
+    """Creation offset in seconds; later indexes are newer, as in production."""
+    return SPAN_SECONDS * index // max(count, 1)
+
+
+def batch_rng(seed, kind, batch_no):
+    return random.Random(f"{seed}-{kind}-{batch_no}")
+
+
+def job_table(args):
+    """Per-job attributes shared by the job and application generators."""
+    rng = random.Random(f"{args.seed}-jobs")
+    recruiters = zipf_cum_weights(args.recruiters)
+    table = []
+    for index in range(args.jobs):
+        table.append((
+            rng.choices(range(args.recruiters), cum_weights=recruiters)[0],
+            rng.randrange(len(TITLES)),
+            "open" if rng.random() < 0.8 else "closed",
+        ))
+    # Popularity is independent of age: rank jobs in a seeded random order
+    popularity = list(range(args.jobs))
+    rng.shuffle(popularity)
+    return table, popularity
+
+
+# Worker process state, set by _init_worker
+_state = {}
+
+
+def _init_worker(args, table, popularity, password_hash):
+    _state.update(
+        args=args,
+        db=MongoClient(MONGO_URI)[MONGO_DB_NAME],
+        jobs=table,
+        popularity=popularity,
+        popularity_weights=zipf_cum_weights(len(popularity)) if popularity else [],
+        skill_weights=zipf_cum_weights(len(SKILLS), 0.8),
+        password_hash=password_hash,
+    )
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _recruiter(rng, index):
+    args = _state["args"]
+    seconds = spread(index, args.recruiters)
+    return {
+        "_id": object_id("recruiter", index, seconds),
+        "name": _name(rng),
+        "email": f"recruiter{index}@{EMAIL_DOMAIN}",
+        "password": _state["password_hash"],
+        "role": "recruiter",
+        "company": f"{COMPANIES[index % len(COMPANIES)]} {index}",
+        "created_at": START + timedelta(seconds=seconds),
+        "is_active": True,
+    }
+
+
+def _job(rng, index):
+    args = _state["args"]
+    recruiter, title, status = _state["jobs"][index]
+    seconds = spread(index, args.jobs)
+    skills = rng.choices(SKILLS, cum_weights=_state["skill_weights"], k=rng.randint(2, 6))
+    return {
+        "_id": object_id("job", index, seconds),
+        "title": TITLES[title],
+        "skills_required": ", ".join(dict.fromkeys(skills)),
+        "experience_years": rng.choice([0, 1, 2, 3, 3, 5, 5, 8]),
+        "qualification": rng.choice(DEGREES),
+        "description": f"Join {COMPANIES[recruiter % len(COMPANIES)]} as a {TITLES[title]}.",
+        "location": rng.choice(LOCATIONS),
+        "salary_range": f"${rng.randrange(40, 120, 5)},000 - ${rng.randrange(125, 200, 5)},000",
+        "company_id": str(object_id("recruiter", recruiter, spread(recruiter, args.recruiters))),
+        "company_name": f"{COMPANIES[recruiter % len(COMPANIES)]} {recruiter}",
+        "recruiter_name": f"Recruiter {recruiter}",
+        "created_at": START + timedelta(seconds=seconds),
+        "status": status,
+    }
+
+
+def _profile(rng):
+    skills = rng.choices(SKILLS, cum_weights=_state["skill_weights"], k=rng.randint(0, 8))
+    experience = []
+    year = rng.randint(2008, 2022)
+    for _ in range(rng.choice([0, 1, 1, 2, 3])):
+        end = min(year + rng.randint(1, 4), 2025)
+        experience.append({"company": rng.choice(COMPANIES), "role": rng.choice(TITLES), "duration": f"{year}-{end}"})
+        year = end
+    return {
+        "skills": list(dict.fromkeys(skills)),
+        "experience": experience,
+        "education": [{"degree": rng.choice(DEGREES), "university": "State University"}] if rng.random() < 0.85 else [],
+        "certifications": ["AWS Certified"] if rng.random() < 0.2 else [],
+        "projects": [],
+        "bio": "Developer looking for new challenges." if rng.random() < 0.6 else "",
+        "profile_picture": None,
+    }
+
+
+def _candidate_with_applications(rng, index):
+    args = _state["args"]
+    seconds = spread(index, args.candidates)
+    name = _name(rng)
+    email = f"candidate{index}@{EMAIL_DOMAIN}"
+    candidate_id = object_id("candidate", index, seconds)
+    profile = _profile(rng)
+    candidate = {
+        "_id": candidate_id,
+        "name": name,
+        "email": email,
+        "password": _state["password_hash"],
+        "role": "candidate",
+        "company": None,
+        "created_at": START + timedelta(seconds=seconds),
+        "is_active": True,
+        "profile": profile,
+        "profile_completion": profile_completion(profile),
+    }
+
+    applications = []
+    jobs = _state["jobs"]
+    if not jobs:
+        return candidate, applications
+    # Long-tailed applications per candidate with the requested mean
+    mean = args.applications / max(args.candidates, 1)
+    cap = min(MAX_APPLICATIONS_PER_CANDIDATE, len(jobs) // 2 or 1)
+    count = min(cap, int(rng.lognormvariate(math.log(mean) - 0.5, 1.0))) if mean > 0 else 0
+    chosen = set()
+    for _ in range(4):
+        if len(chosen) >= count:
+            break
+        ranks = rng.choices(range(len(jobs)), cum_weights=_state["popularity_weights"], k=count - len(chosen))
+        chosen.update(_state["popularity"][rank] for rank in ranks)
+    for slot, job_index in enumerate(sorted(chosen)[:count]):
+        recruiter, title, _ = jobs[job_index]
+        applied = max(seconds, spread(job_index, args.jobs)) + rng.randint(0, 30 * 24 * 3600)
+        status = rng.choices(APPLICATION_STATUSES, weights=STATUS_WEIGHTS)[0]
+        application = {
+            "_id": object_id("application", index * 256 + slot, applied),
+            "job_id": str(object_id("job", job_index, spread(job_index, args.jobs))),
+            "job_title": TITLES[title],
+            "candidate_id": str(candidate_id),
+            "candidate_name": name,
+            "candidate_email": email,
+            "recruiter_id": str(object_id("recruiter", recruiter, spread(recruiter, args.recruiters))),
+            "status": status,
+            "applied_at": START + timedelta(seconds=applied),
+        }
+        if status != "pending":
+            application["updated_at"] = application["applied_at"] + timedelta(days=rng.randint(1, 21))
+        applications.append(application)
+    return candidate, applications
+
+
+def _generate(task):
+    kind, batch_no, start, end = task
+    args = _state["args"]
+    db = _state["db"]
+    rng = batch_rng(args.seed, kind, batch_no)
+    if kind == "recruiter":
+        db.users.insert_many([_recruiter(rng, index) for index in range(start, end)], ordered=False)
+        return kind, end - start, 0
+    if kind == "job":
+        db.jobs.insert_many([_job(rng, index) for index in range(start, end)], ordered=False)
+        return kind, end - start, 0
+    candidates, applications = [], []
+    for index in range(start, end):
+        candidate, candidate_applications = _candidate_with_applications(rng, index)
+        candidates.append(candidate)
+        applications.extend(candidate_applications)
+    db.users.insert_many(candidates, ordered=False)
+    for offset in range(0, len(applications), args.batch_size):
+        db.applications.insert_many(applications[offset:offset + args.batch_size], ordered=False)
+    return kind, end - start, len(applications)
+
+
+def _tasks(kind, count, batch_size):
+    for batch_no, start in enumerate(range(0, count, batch_size)):
+        yield kind, batch_no, start, min(start + batch_size, count)
+
+
+async def _finish(database):
+    from database import client
+    from indexes import ensure_indexes
+    import job_counters
+    import platform_stats
+
+    try:
+        await ensure_indexes(database)
+        await job_counters.recompute_counters(database)
+        await platform_stats.reconcile(database)
+    finally:
+        client.close()
+
+
+def main(args):
+    import passwords
+    from database import db as async_db
+
+    sync_db = MongoClient(MONGO_URI)[MONGO_DB_NAME]
+    if args.drop:
+        sync_db.users.delete_many({"role": {"$ne": "admin"}})
+        sync_db.jobs.drop()
+        sync_db.applications.drop()
+
+    password_hash = passwords.pwd_context.hash(PASSWORD)
+    table, popularity = job_table(args)
+    # Candidates carry their applications, so keep those batches smaller
+    candidate_batch = max(1, args.batch_size // max(1, round(args.applications / max(args.candidates, 1))))
+
+    started = time.perf_counter()
+    totals = {"recruiter": 0, "job": 0, "candidate": 0, "application": 0}
+    with multiprocessing.Pool(args.workers, _init_worker, (args, table, popularity, password_hash)) as pool:
+        for kind, count, batch in (
+            ("recruiter", args.recruiters, args.batch_size),
+            ("job", args.jobs, args.batch_size),
+            ("candidate", args.candidates, candidate_batch),
+        ):
+            for done_kind, documents, applications in pool.imap_unordered(_generate, _tasks(kind, count, batch)):
+                totals[done_kind] += documents
+                totals["application"] += applications
+            print(f"{kind}s: {totals[kind]}  applications: {totals['application']}  "
+                  f"({time.perf_counter() - started:.0f}s)")
+
+    print("Building indexes, job counters and platform stats...")
+    asyncio.run(_finish(async_db))
+    print(f"Done in {time.perf_counter() - started:.0f}s. Every account's password is {PASSWORD!r}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--recruiters", type=int, default=None, help="default: jobs / 10")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--applications", type=int, default=100000, help="approximate total")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop", action="store_true", help="remove existing non-admin users, jobs and applications")
+    args = parser.parse_args()
+    args.recruiters = args.recruiters or max(1, args.jobs // 10)
+    main(args)
@@ -0,0 +1,279 @@
+"""Index registry for the RecruiterYu collections.
+
+The API applies these indexes at startup. Run this module directly to apply
+them by hand or to verify that every query shape issued by the routes is
+served by an index, sort included:
+
+    python indexes.py apply
+    python indexes.py verify
+
+The API does not start without the unique (job_id, candidate_id) index.
+Duplicate applications left by the old check-then-insert apply keep it from
+building; review and remove them with:
+
+    python indexes.py dedupe
+"""
+import asyncio
+import logging
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+UNIQUE_APPLICATION_INDEX = "job_id_candidate_id_unique"
+
+# Replaced indexes, dropped before the registry is applied. Single-field
+# indexes are prefixes of the compound ones replacing them, so keeping them
+# would only add write overhead.
+RETIRED_INDEXES = {
+    "users": [
+        "role",
+        # Before profile_completion joined it
+        "role_id",
+    ],
+    "jobs": [
+        "company_id",
+        # Lacked the _id tie-breaker of the keyset search, so pages sorted in memory
+        "status_created_at",
+    ],
+    "applications": [
+        "candidate_id",
+        # Non-unique predecessor of UNIQUE_APPLICATION_INDEX, on the same keys
+        "job_id_candidate_id",
+    ],
+}
+
+# The API refuses to start without these: correctness depends on them
+REQUIRED_INDEXES = {"applications": [UNIQUE_APPLICATION_INDEX]}
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # Equality, sort, range: also serves plain role listings via its prefix
+        IndexModel(
+            [("role", ASCENDING), ("_id", DESCENDING), ("profile_completion", ASCENDING)],
+            name="role_id_profile_completion",
+        ),
+        # Incremental backups, see backups.run_backup
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # Only soft-deleted users, see deletions.hidden_user_ids
+        IndexModel(
+            [("deleted_at", ASCENDING)], name="deleted_at_partial",
+            partialFilterExpression={"deleted_at": {"$type": "date"}},
+        ),
+    ],
+    "jobs": [
+        IndexModel([("company_id", ASCENDING), ("_id", DESCENDING)], name="company_id_id"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id",
+        ),
+        IndexModel(
+            [("title", TEXT), ("skills_required", TEXT), ("company_name", TEXT), ("description", TEXT)],
+            name="job_search_text",
+            weights={"title": 10, "skills_required": 5, "company_name": 3, "description": 1},
+        ),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "applications": [
+        # One application per job and candidate; apply relies on it against double submits
+        IndexModel([("job_id", ASCENDING), ("candidate_id", ASCENDING)], name=UNIQUE_APPLICATION_INDEX, unique=True),
+        IndexModel([("candidate_id", ASCENDING), ("_id", DESCENDING)], name="candidate_id_id"),
+        # Paged applications of a recruiter's jobs merge per-job _id order instead of sorting
+        IndexModel([("job_id", ASCENDING), ("_id", DESCENDING)], name="job_id_id"),
+        IndexModel([("recruiter_id", ASCENDING)], name="recruiter_id"),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "deletion_jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ],
+}
+
+_SAMPLE_ID = ObjectId()
+_SAMPLE_REF = str(_SAMPLE_ID)
+_SAMPLE_TIME = datetime(2024, 1, 1)
+_CHANGED_SINCE = {"$or": [{"_id": {"$gte": _SAMPLE_ID}}, {"updated_at": {"$gte": _SAMPLE_TIME}}]}
+
+# (collection, filter, sort) for every query the routes issue
+QUERY_SHAPES = [
+    ("users", {"email": "someone@example.com"}, None),
+    ("users", {"email": "someone@example.com", "_id": {"$ne": _SAMPLE_ID}}, None),
+    ("users", {"_id": _SAMPLE_ID}, None),
+    ("users", {"role": "recruiter"}, None),
+    ("users", {"role": "candidate"}, None),
+    ("users", {"deleted_at": {"$type": "date"}}, None),
+    ("jobs", {"_id": _SAMPLE_ID}, None),
+    ("jobs", {"_id": _SAMPLE_ID, "company_id": _SAMPLE_REF}, None),
+    ("jobs", {"company_id": _SAMPLE_REF}, None),
+    ("jobs", {"status": "open"}, [("created_at", DESCENDING)]),
+    ("jobs", {"status": "open"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("jobs", {"status": "open", "$text": {"$search": "python developer"}}, None),
+    ("applications", {"_id": _SAMPLE_ID}, None),
+    ("applications", {"_id": _SAMPLE_ID, "candidate_id": _SAMPLE_REF}, None),
+    ("applications", {"job_id": _SAMPLE_REF}, None),
+    ("applications", {"job_id": {"$in": [_SAMPLE_REF]}}, None),
+    ("applications", {"candidate_id": _SAMPLE_REF}, None),
+    ("applications", {"recruiter_id": _SAMPLE_REF}, None),
+    ("applications", {"_id": _SAMPLE_ID, "recruiter_id": _SAMPLE_REF}, None),
+    ("applications", {"_id": {"$in": [_SAMPLE_ID]}, "recruiter_id": _SAMPLE_REF}, None),
+    ("applications", {"job_id": _SAMPLE_REF, "status": "pending", "recruiter_id": _SAMPLE_REF}, None),
+    ("applications", {"$or": [{"candidate_id": _SAMPLE_REF}, {"recruiter_id": _SAMPLE_REF}]}, None),
+    ("applications", {"recruiter_id": _SAMPLE_REF, "candidate_id": {"$in": [_SAMPLE_REF]}}, None),
+    # Incremental backups; the small settings collections are scanned
+    ("users", _CHANGED_SINCE, None),
+    ("jobs", _CHANGED_SINCE, None),
+    ("applications", _CHANGED_SINCE, None),
+    # Keyset-paginated list endpoints
+    ("users", {"$and": [{"role": "candidate"}, {"_id": {"$lt": _SAMPLE_ID}}]}, [("_id", DESCENDING)]),
+    ("users", {"role": "candidate", "profile_completion": {"$lt": 60}}, [("_id", DESCENDING)]),
+    ("jobs", {"$and": [{"company_id": _SAMPLE_REF}, {"_id": {"$lt": _SAMPLE_ID}}]}, [("_id", DESCENDING)]),
+    ("applications", {"$and": [{"candidate_id": _SAMPLE_REF}, {"_id": {"$lt": _SAMPLE_ID}}]}, [("_id", DESCENDING)]),
+    ("applications", {"$and": [{"job_id": {"$in": [_SAMPLE_REF]}}, {"_id": {"$lt": _SAMPLE_ID}}]}, [("_id", DESCENDING)]),
+]
+
+
+async def ensure_indexes(db):
+    """Create every registered index, one at a time. Safe to call repeatedly.
+
+    Never changes data: raises RuntimeError when a REQUIRED_INDEXES entry
+    cannot be built, e.g. because duplicates violate it.
+    """
+    for collection, names in RETIRED_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+
+    missing = []
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                # An index with the same name but different options, or data
+                # that violates a unique index; optional ones are only logged
+                logger.warning("Could not create index %s on %s: %s", name, collection, e)
+                if name in REQUIRED_INDEXES.get(collection, []):
+                    missing.append(f"{collection}.{name}")
+    if missing:
+        raise RuntimeError(f"Required index(es) missing: {', '.join(missing)}; run `python indexes.py dedupe`")
+
+
+# How far an application got; dedupe keeps the furthest one of a (job, candidate)
+_STATUS_PROGRESS = {"pending": 0, "rejected": 1, "approved": 2, "hired": 3}
+
+
+def _progress(application):
+    changed = application.get("updated_at") or application.get("applied_at") or datetime.min
+    return (_STATUS_PROGRESS.get(application.get("status"), -1), changed, application["_id"])
+
+
+async def remove_duplicate_applications(db):
+    """Keep one application per (job, candidate) so the unique index can build.
+
+    The most advanced status wins, then the most recent change. Returns one
+    entry per removed application: its id and status and the id kept instead.
+    """
+    import job_counters
+    import platform_stats
+    import resource_versions
+
+    groups = db.applications.aggregate([
+        {"$group": {
+            "_id": {"job_id": "$job_id", "candidate_id": "$candidate_id"},
+            "recruiter_id": {"$first": "$recruiter_id"},
+            "applications": {"$push": {
+                "_id": "$_id", "status": "$status", "updated_at": "$updated_at", "applied_at": "$applied_at",
+            }},
+        }},
+        {"$match": {"applications.1": {"$exists": True}}},
+    ], allowDiskUse=True)
+    removed = []
+    recruiters = set()
+    async for group in groups:
+        kept = max(group["applications"], key=_progress)
+        duplicates = [application for application in group["applications"] if application is not kept]
+        query = {**group["_id"], "_id": {"$in": [application["_id"] for application in duplicates]}}
+        await job_counters.release_applications(db, query)
+        await db.applications.delete_many(query)
+        recruiters.add(group.get("recruiter_id"))
+        removed.extend(
+            {**group["_id"], "application_id": application["_id"], "status": application.get("status"), "kept": kept["_id"]}
+            for application in duplicates
+        )
+    if removed:
+        await platform_stats.bump(db, applications=-len(removed))
+        await resource_versions.bump(
+            db, resource_versions.APPLICATIONS, resource_versions.JOBS,
+            *{resource_versions.candidate(entry["candidate_id"]) for entry in removed},
+            *map(resource_versions.recruiter, recruiters)
+        )
+    return removed
+
+
+def _stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+async def verify_query_plans(db):
+    """Explain every registered query shape; return the ones that scan a collection or sort in memory."""
+    failures = []
+    for collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = set(_stages(winning_plan))
+        status = next((stage for stage in ("COLLSCAN", "SORT") if stage in stages), "ok")
+        print(f"{status:8} {collection}.find({query}){' sort ' + str(sort) if sort else ''}")
+        if status != "ok":
+            failures.append((collection, query, sort))
+    return failures
+
+
+async def _main(command):
+    from database import client, db
+
+    try:
+        if command == "apply":
+            await ensure_indexes(db)
+            print("Indexes applied")
+            return 0
+        if command == "dedupe":
+            removed = await remove_duplicate_applications(db)
+            for entry in removed:
+                print(
+                    f"removed {entry['application_id']} ({entry['status']}) job {entry['job_id']} "
+                    f"candidate {entry['candidate_id']}, kept {entry['kept']}"
+                )
+            print(f"Removed {len(removed)} duplicate application(s)")
+            await ensure_indexes(db)
+            return 0
+        failures = await verify_query_plans(db)
+        if failures:
+            print(f"\n{len(failures)} query shape(s) fall back to COLLSCAN or an in-memory SORT")
+            return 1
+        print("\nAll query shapes are served by an index")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command not in ("apply", "verify", "dedupe"):
+        print("Usage: python indexes.py [apply|verify|dedupe]")
+        sys.exit(2)
+    sys.exit(asyncio.run(_main(command)))
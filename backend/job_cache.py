@@ -0,0 +1,35 @@
+from bson import ObjectId
+from decouple import config
+
+from cache import LRUCache
+from deletions import ACTIVE
+
+JOB_CACHE_SIZE = config("JOB_CACHE_SIZE", default=10000, cast=int)
+# Invalidated by invalidate() when jobs are deleted
+JOB_CACHE_TTL = config("JOB_CACHE_TTL", default=10, cast=float)
+
+# Job id -> the fields an application copies from its job
+jobs = LRUCache(JOB_CACHE_SIZE, ttl=JOB_CACHE_TTL)
+
+FIELDS = {"title": 1, "company_id": 1}
+
+
+async def get_job(db, job_id):
+    """Title and owner of an active job, or None; hot jobs skip the database."""
+    job = jobs.get(job_id)
+    if job is None:
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = await db.jobs.find_one({"_id": ObjectId(job_id), **ACTIVE}, FIELDS)
+        if job is None:
+            return None
+        jobs.set(job_id, job)
+    return job
+
+
+def invalidate(*job_ids):
+    """Call after deleting jobs; without ids the whole cache is dropped."""
+    if not job_ids:
+        jobs.clear()
+    for job_id in job_ids:
+        jobs.pop(job_id)
@@ -0,0 +1,133 @@
+"""Application counters maintained on job documents.
+
+Each job carries `total_applications` and a `status_counts` breakdown that the
+write paths keep current with $inc. Jobs created before the counters existed
+get them at startup; run this module directly to recompute the counters for
+every job from the applications collection:
+
+    python job_counters.py
+"""
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+APPLICATION_STATUSES = ("pending", "approved", "rejected", "hired")
+
+
+def empty_counters():
+    return {
+        "total_applications": 0,
+        "status_counts": {status: 0 for status in APPLICATION_STATUSES},
+    }
+
+
+def _counter_update(inc):
+    # updated_at lets incremental backups pick up counter changes
+    return {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}}
+
+
+def _increments(status, delta):
+    inc = {"total_applications": delta}
+    if status in APPLICATION_STATUSES:
+        inc[f"status_counts.{status}"] = delta
+    return inc
+
+
+async def record_application(db, job_id, status="pending", delta=1):
+    await db.jobs.update_one({"_id": ObjectId(job_id)}, _counter_update(_increments(status, delta)))
+
+
+async def record_status_change(db, job_id, old_status, new_status):
+    if old_status == new_status:
+        return
+    inc = {}
+    if old_status in APPLICATION_STATUSES:
+        inc[f"status_counts.{old_status}"] = -1
+    if new_status in APPLICATION_STATUSES:
+        inc[f"status_counts.{new_status}"] = 1
+    if inc:
+        await db.jobs.update_one({"_id": ObjectId(job_id)}, _counter_update(inc))
+
+
+async def record_status_changes(db, changes, new_status):
+    """Apply many status changes at once; `changes` maps (job_id, old_status) to a count."""
+    incs = {}
+    for (job_id, old_status), count in changes.items():
+        if old_status == new_status or not ObjectId.is_valid(job_id):
+            continue
+        inc = incs.setdefault(job_id, {})
+        if old_status in APPLICATION_STATUSES:
+            inc[f"status_counts.{old_status}"] = inc.get(f"status_counts.{old_status}", 0) - count
+        if new_status in APPLICATION_STATUSES:
+            inc[f"status_counts.{new_status}"] = inc.get(f"status_counts.{new_status}", 0) + count
+    updates = [UpdateOne({"_id": ObjectId(job_id)}, _counter_update(inc)) for job_id, inc in incs.items() if inc]
+    if updates:
+        await db.jobs.bulk_write(updates, ordered=False)
+
+
+async def release_applications(db, query):
+    """Decrement job counters for the applications matching query.
+
+    Call this before deleting those applications.
+    """
+    groups = await db.applications.aggregate([
+        {"$match": query},
+        {"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "count": {"$sum": 1}}},
+    ]).to_list(length=None)
+    updates = [
+        UpdateOne(
+            {"_id": ObjectId(group["_id"]["job_id"])},
+            _counter_update(_increments(group["_id"]["status"], -group["count"])),
+        )
+        for group in groups
+        if ObjectId.is_valid(group["_id"]["job_id"])
+    ]
+    if updates:
+        await db.jobs.bulk_write(updates, ordered=False)
+
+
+async def recompute_counters(db, missing_only=False):
+    """Rebuild the counters of every job with a single aggregation.
+
+    With `missing_only`, only jobs that have no counters yet are counted.
+    """
+    status_counts = {
+        status: {"$sum": {"$map": {
+            "input": "$counts",
+            "in": {"$cond": [{"$eq": ["$$this._id", status]}, "$$this.count", 0]},
+        }}}
+        for status in APPLICATION_STATUSES
+    }
+    pipeline = [{"$match": {"total_applications": {"$exists": False}}}] if missing_only else []
+    await db.jobs.aggregate(pipeline + [
+        {"$project": {"job_id": {"$toString": "$_id"}}},
+        {"$lookup": {
+            "from": "applications",
+            "localField": "job_id",
+            "foreignField": "job_id",
+            "pipeline": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "as": "counts",
+        }},
+        {"$project": {
+            "total_applications": {"$sum": "$counts.count"},
+            "status_counts": status_counts,
+            "updated_at": "$$NOW",
+        }},
+        {"$merge": {"into": "jobs", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+    ]).to_list(length=None)
+
+
+async def _main():
+    from database import client, db
+
+    try:
+        await recompute_counters(db)
+        print("Job application counters recomputed")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from decouple import config
+from pymongo import DESCENDING
+
+# Invalidated by invalidate() on job writes, and reloaded early when the
+# shared "jobs" change counter moves
+OPEN_JOBS_SNAPSHOT_TTL = config("OPEN_JOBS_SNAPSHOT_TTL", default=30, cast=float)
+
+
+class OpenJobsSnapshot:
+    """In-process, versioned copy of all open jobs.
+
+    Write paths call invalidate() to bump the version; the next reader reloads
+    the snapshot with a single query. Jobs are ordered newest first. Readers
+    must not mutate the returned job dicts.
+    """
+
+    def __init__(self, ttl=OPEN_JOBS_SNAPSHOT_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._loaded_version = -1
+        self._source_version = None
+        self._loaded_at = 0.0
+        self._jobs = []
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.version += 1
+
+    def _is_fresh(self, source_version):
+        return (
+            self._loaded_version == self.version
+            and (source_version is None or source_version == self._source_version)
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self, db, source_version=None):
+        """`source_version` is the shared "jobs" change counter (see
+        resource_versions); when it moved, the snapshot is reloaded even within
+        the TTL, which picks up writes made by other processes."""
+        if self._is_fresh(source_version):
+            return self._jobs
+        async with self._lock:
+            if self._is_fresh(source_version):
+                return self._jobs
+            version = self.version
+            jobs = await db.jobs.find({"status": "open", "deleted_at": None}).sort("_id", DESCENDING).to_list(length=None)
+            for job in jobs:
+                job["_id"] = str(job["_id"])
+            self._jobs = jobs
+            self._loaded_version = version
+            self._source_version = source_version
+            self._loaded_at = time.monotonic()
+            return jobs
+
+
+open_jobs = OpenJobsSnapshot()
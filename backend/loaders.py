@@ -0,0 +1,76 @@
+import asyncio
+
+from bson import ObjectId
+
+from database import db
+from deletions import ACTIVE
+
+
+class DataLoader:
+    """Request-scoped batching loader.
+
+    Keys requested via load()/load_many() during the same event-loop tick are
+    deduplicated and resolved with a single call to batch_fn, which receives a
+    list of keys and returns a dict of key -> value. Results are memoized for
+    the lifetime of the loader, so create one loader per request.
+    """
+
+    def __init__(self, batch_fn, default=None):
+        self._batch_fn = batch_fn
+        self._default = default
+        self._cache = {}
+        self._queue = {}
+        # The event loop only keeps weak references to tasks
+        self._dispatches = set()
+
+    def load(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        if not self._queue:
+            loop.call_soon(self._schedule_dispatch)
+        self._queue[key] = future
+        return future
+
+    async def load_many(self, keys):
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _schedule_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self):
+        queue, self._queue = self._queue, {}
+        try:
+            results = await self._batch_fn(list(queue))
+        except Exception as e:
+            for key, future in queue.items():
+                self._cache.pop(key, None)
+                future.set_exception(e)
+            return
+        for key, future in queue.items():
+            future.set_result(results.get(key, self._default))
+
+
+async def _find_by_ids(collection, ids, projection=None):
+    object_ids = [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+    if not object_ids:
+        return {}
+    # Soft-deleted documents load as missing
+    docs = await collection.find({"_id": {"$in": object_ids}, **ACTIVE}, projection).to_list(length=None)
+    return {str(doc["_id"]): doc for doc in docs}
+
+
+class Loaders:
+    """The set of loaders available to a single request."""
+
+    def __init__(self):
+        self.users = DataLoader(lambda ids: _find_by_ids(db.users, ids, {"password": 0, "claim_token": 0}))
+        self.jobs = DataLoader(lambda ids: _find_by_ids(db.jobs, ids))
+
+
+def get_loaders():
+    return Loaders()
@@ -1,22 +1,48 @@
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
-from pymongo import MongoClient
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from jose import JWTError, jwt
-import os
+import asyncio
+import hashlib
+import re
+import secrets
 from bson import ObjectId
-import shutil
+from decouple import config
+from pymongo.errors import DuplicateKeyError
+
+from database import client, db
+import passwords
+from passwords import verify_password, get_password_hash
+from indexes import ensure_indexes
+from job_snapshot import open_jobs
+from loaders import Loaders, get_loaders
+import job_counters
+import platform_stats
+from pagination import page_size, encode_cursor, decode_cursor, PageParams
+import screening
+import reports
+import profiles
+import auth_cache
+import job_cache
+import resource_versions
+from resource_versions import USERS, JOBS, APPLICATIONS
+import blob_store
+import upload_responses
+import deletions
+from deletions import ACTIVE
+import backups
+import bulk_import
+import metrics
+import application_status
 
 app = FastAPI(title="RecruiterYu API", version="1.0.0")
 
-# Create uploads directory
-os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Uploaded files, local directory or GridFS depending on BLOB_STORE
+uploads = blob_store.create_store(db)
 
 # CORS middleware
 app.add_middleware(
@@ -27,17 +53,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Oversized pictures are refused before their body is read
+app.add_middleware(blob_store.UploadSizeLimit, paths=["/api/candidate/upload-profile-picture"])
+
+# Added last so it wraps everything, CORS preflights included
+app.add_middleware(metrics.MetricsMiddleware)
+
+background_tasks = set()
+
+@app.on_event("startup")
+async def apply_indexes():
+    await ensure_indexes(db)
+
+@app.on_event("startup")
+async def backfill_job_counters():
+    # Jobs from before the counters would show 0 and go negative on withdraw
+    await job_counters.recompute_counters(db, missing_only=True)
+
+@app.on_event("startup")
+async def start_platform_stats_reconciliation():
+    task = asyncio.create_task(platform_stats.run_reconciliation(db))
+    background_tasks.add(task)
+
+@app.on_event("startup")
+async def start_deletion_worker():
+    # Also resumes cascades interrupted by a crash or restart
+    task = asyncio.create_task(deletions.run_worker(db))
+    background_tasks.add(task)
+
+@app.on_event("shutdown")
+async def close_mongo_client():
+    for task in background_tasks:
+        task.cancel()
+    client.close()
+    passwords.shutdown()
+
 # Security
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-security = HTTPBearer()
+# There is no spend data yet, so cost per hire is a configured estimate
+RECRUITER_COST_PER_HIRE = config("RECRUITER_COST_PER_HIRE", default=17000, cast=int)
+
+# Lifetime of the single-use tokens that let imported candidates sign up
+CLAIM_TOKEN_TTL_HOURS = config("CLAIM_TOKEN_TTL_HOURS", default=72, cast=int)
 
-# MongoDB connection
-client = MongoClient("mongodb://localhost:27017/")
-db = client.recruiteryu
+# Bearer token required by /metrics; empty leaves it open to the network
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+security = HTTPBearer()
 
 # Pydantic models
 class UserCreate(BaseModel):
@@ -46,6 +111,8 @@ class UserCreate(BaseModel):
     password: str
     role: str = "candidate"
     company: Optional[str] = None
+    # Issued by an admin for an imported candidate; required to claim that account
+    claim_token: Optional[str] = None
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -73,9 +140,22 @@ class CandidateProfile(BaseModel):
     projects: List[dict] = []
     bio: Optional[str] = None
 
+class CandidateImport(CandidateProfile):
+    name: str
+    email: EmailStr
+
 class ApplicationUpdate(BaseModel):
     status: str  # pending, approved, rejected
     
+class BulkApplicationUpdate(BaseModel):
+    status: str
+    # Either explicit ids...
+    application_ids: Optional[List[str]] = None
+    # ...or a filter on one of the recruiter's jobs
+    job_id: Optional[str] = None
+    current_status: Optional[str] = None
+    older_than_days: Optional[int] = None
+    
 class ProfileUpdate(BaseModel):
     name: str
     email: EmailStr
@@ -124,12 +204,6 @@ class SecuritySettings(BaseModel):
     ipWhitelist: Optional[str] = ""
 
 # Utility functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -146,19 +220,38 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    token = credentials.credentials
+    email = auth_cache.token_subject(token)
+    if email is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        auth_cache.remember_token(token, email, payload.get("exp"))
     
-    user = db.users.find_one({"email": email})
+    # The password hash is never cached; password endpoints load it explicitly
+    user = auth_cache.get_user(email)
     if user is None:
-        raise credentials_exception
+        user = await db.users.find_one({"email": email, **ACTIVE}, {"password": 0})
+        if user is None:
+            raise credentials_exception
+        auth_cache.remember_user(user)
     return user
 
+def conditional_get(*scopes):
+    """Answer If-None-Match from the resource version counters before the handler runs.
+
+    Scopes may reference `{user_id}` (the caller) and path parameters.
+    """
+    async def dependency(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+        params = {"user_id": str(current_user["_id"]), **request.path_params}
+        scope_names = [scope.format(**params) for scope in scopes]
+        return await resource_versions.check(db, request, response, scope_names, current_user["_id"])
+    return Depends(dependency)
+
 # Helper function to convert ObjectId to string
 def convert_objectid(doc):
     if doc and "_id" in doc:
@@ -166,14 +259,37 @@ def convert_objectid(doc):
     return doc
 
 # Routes
+def _claim_token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
 @app.post("/api/auth/signup")
 async def signup(user: UserCreate):
-    # Check if user already exists
-    if db.users.find_one({"email": user.email}):
+    # Check if user already exists; an imported candidate is claimed only with its claim token
+    existing = await db.users.find_one({"email": user.email}, {"_id": 1})
+    if existing and (not user.claim_token or user.role != "candidate"):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
+    
+    if existing:
+        # Matching and removing the token in one update makes it single-use
+        result = await db.users.update_one(
+            {
+                "_id": existing["_id"], "role": "candidate", "password": None, **ACTIVE,
+                "claim_token.hash": _claim_token_hash(user.claim_token),
+                "claim_token.expires_at": {"$gt": datetime.utcnow()},
+            },
+            {
+                "$set": {"password": hashed_password, "name": user.name, "updated_at": datetime.utcnow()},
+                "$unset": {"claim_token": ""},
+            }
+        )
+        if not result.modified_count:
+            raise HTTPException(status_code=400, detail="Invalid or expired claim token")
+        auth_cache.invalidate_user(user.email)
+        await resource_versions.bump(db, USERS, resource_versions.user(str(existing["_id"])))
+        return {"message": "User created successfully", "user_id": str(existing["_id"])}
     
     # Create user document
     user_doc = {
@@ -194,22 +310,36 @@ async def signup(user: UserCreate):
             "profile_picture": None
         } if user.role == "candidate" else {}
     }
+    if user.role == "candidate":
+        user_doc["profile_completion"] = profiles.profile_completion(user_doc["profile"])
     
-    # Insert user
-    result = db.users.insert_one(user_doc)
+    # Insert user; the unique email index settles concurrent signups
+    try:
+        result = await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    await platform_stats.bump(db, role=user.role, users=1)
+    await resource_versions.bump(db, USERS)
     
     return {"message": "User created successfully", "user_id": str(result.inserted_id)}
 
 @app.post("/api/auth/login", response_model=Token)
 async def login(user_credentials: UserLogin):
-    user = db.users.find_one({"email": user_credentials.email})
-    if not user or not verify_password(user_credentials.password, user["password"]):
+    user = await db.users.find_one({"email": user_credentials.email, **ACTIVE})
+    if not user or not await verify_password(user_credentials.password, user.get("password")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes created with an outdated bcrypt cost factor
+    if passwords.needs_rehash(user["password"]):
+        await db.users.update_one(
+            {"_id": user["_id"], "password": user["password"]},
+            {"$set": {"password": await get_password_hash(user_credentials.password), "updated_at": datetime.utcnow()}}
+        )
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user["email"]}, expires_delta=access_token_expires
@@ -231,15 +361,17 @@ async def login(user_credentials: UserLogin):
 
 # Admin routes
 @app.get("/api/admin/stats")
-async def get_admin_stats(current_user: dict = Depends(get_current_user)):
+async def get_admin_stats(current_user: dict = Depends(get_current_user), versions: dict = conditional_get(USERS, JOBS, APPLICATIONS)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    total_users = db.users.count_documents({})
-    total_recruiters = db.users.count_documents({"role": "recruiter"})
-    total_candidates = db.users.count_documents({"role": "candidate"})
-    total_jobs = db.jobs.count_documents({})
-    total_applications = db.applications.count_documents({})
+    # Counters are maintained incrementally by the write endpoints
+    platform = await platform_stats.get_stats(db)
+    total_users = platform.get("total_users", 0)
+    total_recruiters = platform.get("users_by_role", {}).get("recruiter", 0)
+    total_candidates = platform.get("users_by_role", {}).get("candidate", 0)
+    total_jobs = platform.get("total_jobs", 0)
+    total_applications = platform.get("total_applications", 0)
     
     stats = {
         "total_views": total_applications,  # Use applications as views
@@ -252,131 +384,215 @@ async def get_admin_stats(current_user: dict = Depends(get_current_user)):
     }
     return stats
 
+@app.get("/api/admin/auth-cache")
+async def get_auth_cache_stats(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return auth_cache.stats()
+
 @app.get("/api/admin/customers")
-async def get_customers(current_user: dict = Depends(get_current_user)):
+async def get_customers(current_user: dict = Depends(get_current_user), page: PageParams = Depends(), versions: dict = conditional_get(USERS)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get all recruiters/companies
-    customers = list(db.users.find(
-        {"role": "recruiter"},
-        {"password": 0}
-    ))
+    # Get recruiters/companies, newest first
+    customers = await page.fetch(db.users, {"role": "recruiter", **ACTIVE}, {"password": 0})
     
     # Convert ObjectId to string
     for customer in customers:
         customer["_id"] = str(customer["_id"])
     
-    return customers
+    return page.response(customers)
 
 @app.delete("/api/admin/customers/{user_id}")
 async def delete_customer(user_id: str, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Delete user and their related data
-    user_result = db.users.delete_one({"_id": ObjectId(user_id)})
-    if user_result.deleted_count == 0:
+    # Hide the user now; their jobs and applications are removed in the background
+    user = await deletions.soft_delete_user(db, user_id)
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    auth_cache.invalidate_user(user.get("email"))
+    open_jobs.invalidate()
+    if user.get("role") == "recruiter":
+        job_cache.invalidate()
+    
+    affected_recruiters = await db.applications.distinct("recruiter_id", {"candidate_id": user_id})
+    deletion_job_id = await deletions.enqueue(db, "user", user_id, str(current_user["_id"]))
+    await resource_versions.bump(
+        db, USERS, JOBS, APPLICATIONS, *resource_versions.account(user_id),
+        *map(resource_versions.recruiter, affected_recruiters)
+    )
     
-    # Delete their jobs and applications
-    db.jobs.delete_many({"company_id": user_id})
-    db.applications.delete_many({"$or": [{"candidate_id": user_id}, {"recruiter_id": user_id}]})
-    
-    return {"message": "Customer deleted successfully"}
+    return {"message": "Customer deleted successfully", "deletion_job_id": deletion_job_id}
 
 @app.get("/api/admin/candidates")
-async def get_candidates(current_user: dict = Depends(get_current_user)):
+async def get_candidates(
+    completion_below: Optional[int] = None,
+    completion_at_least: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    page: PageParams = Depends(),
+    versions: dict = conditional_get(USERS)
+):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get all candidates
-    candidates = list(db.users.find(
-        {"role": "candidate"},
-        {"password": 0}
-    ))
+    # Get candidates, newest first, optionally filtered by stored profile completion
+    query = {"role": "candidate", **ACTIVE}
+    if completion_below is not None or completion_at_least is not None:
+        query["profile_completion"] = {}
+        if completion_below is not None:
+            query["profile_completion"]["$lt"] = completion_below
+        if completion_at_least is not None:
+            query["profile_completion"]["$gte"] = completion_at_least
+    candidates = await page.fetch(db.users, query, {"password": 0, "claim_token": 0})
     
-    # Add profile completion percentage for each candidate
     for candidate in candidates:
         candidate["_id"] = str(candidate["_id"])
-        profile = candidate.get("profile", {})
-        
-        # Calculate profile completion percentage
-        completion_score = 0
-        if profile.get("bio"):
-            completion_score += 20
-        if profile.get("skills") and len(profile["skills"]) > 0:
-            completion_score += 20
-        if profile.get("experience") and len(profile["experience"]) > 0:
-            completion_score += 20
-        if profile.get("education") and len(profile["education"]) > 0:
-            completion_score += 20
-        if profile.get("profile_picture"):
-            completion_score += 20
-            
-        candidate["profile_completion"] = completion_score
-    
-    return candidates
+        # Fallback for candidates not yet backfilled
+        if "profile_completion" not in candidate:
+            candidate["profile_completion"] = profiles.profile_completion(candidate.get("profile"))
+    
+    return page.response(candidates)
+
+@app.post("/api/admin/candidates/import")
+async def import_candidates(file: UploadFile = File(...), format: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    fmt = bulk_import.detect_format(file.filename, format)
+    
+    # Imported candidates have no password until they sign up with a claim token
+    def candidate_document(record):
+        candidate = CandidateImport.model_validate(record)
+        profile = {
+            **candidate.model_dump(include=set(CandidateProfile.model_fields)),
+            "bio": candidate.bio or "",
+            "profile_picture": None,
+        }
+        return {
+            "name": candidate.name,
+            "email": candidate.email,
+            "password": None,
+            "role": "candidate",
+            "company": None,
+            "created_at": datetime.utcnow(),
+            "is_active": True,
+            "profile": profile,
+            "profile_completion": profiles.profile_completion(profile),
+        }
+    
+    async def record_batch(inserted):
+        await platform_stats.bump(db, role="candidate", users=inserted)
+    
+    report = await bulk_import.import_rows(
+        file, fmt, db.users, candidate_document,
+        list_fields=("skills", "experience", "education", "certifications", "projects"),
+        on_batch=record_batch
+    )
+    await resource_versions.bump(db, USERS)
+    
+    return report
+
+@app.post("/api/admin/candidates/{candidate_id}/claim-token")
+async def issue_claim_token(candidate_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Only imported candidates that nobody has claimed yet; a new token replaces the previous one
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.utcnow() + timedelta(hours=CLAIM_TOKEN_TTL_HOURS)
+    result = await db.users.update_one(
+        {"_id": ObjectId(candidate_id), "role": "candidate", "password": None, **ACTIVE},
+        {"$set": {
+            "claim_token": {"hash": _claim_token_hash(token), "expires_at": expires_at},
+            "updated_at": datetime.utcnow(),
+        }}
+    )
+    if not result.matched_count:
+        raise HTTPException(status_code=404, detail="Unclaimed imported candidate not found")
+    
+    # Only the hash is stored, so the token is shown this once for the admin to send
+    return {"claim_token": token, "expires_at": expires_at}
 
 @app.delete("/api/admin/candidates/{candidate_id}")
 async def delete_candidate(candidate_id: str, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Delete candidate and their related data
-    candidate_result = db.users.delete_one({"_id": ObjectId(candidate_id), "role": "candidate"})
-    if candidate_result.deleted_count == 0:
+    # Hide the candidate now; their applications are removed in the background
+    candidate = await deletions.soft_delete_user(db, candidate_id, role="candidate")
+    if candidate is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
+    auth_cache.invalidate_user(candidate.get("email"))
+    
+    affected_recruiters = await db.applications.distinct("recruiter_id", {"candidate_id": candidate_id})
+    deletion_job_id = await deletions.enqueue(db, "user", candidate_id, str(current_user["_id"]))
+    await resource_versions.bump(
+        db, USERS, APPLICATIONS, *resource_versions.account(candidate_id),
+        *map(resource_versions.recruiter, affected_recruiters)
+    )
     
-    # Delete their applications
-    db.applications.delete_many({"candidate_id": candidate_id})
+    return {"message": "Candidate deleted successfully", "deletion_job_id": deletion_job_id}
+
+@app.get("/api/deletion-jobs/{job_id}")
+async def get_deletion_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await deletions.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    if current_user["role"] != "admin" and job["requested_by"] != str(current_user["_id"]):
+        raise HTTPException(status_code=403, detail="Not authorized")
     
-    return {"message": "Candidate deleted successfully"}
+    return convert_objectid(job)
 
 @app.get("/api/admin/company/{company_id}/jobs")
-async def get_company_jobs(company_id: str, current_user: dict = Depends(get_current_user)):
+async def get_company_jobs(company_id: str, current_user: dict = Depends(get_current_user), versions: dict = conditional_get("recruiter:{company_id}")):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    jobs = list(db.jobs.find({"company_id": company_id}))
+    # Application counts are maintained on the job documents
+    jobs = await db.jobs.find({"company_id": company_id, **ACTIVE}).to_list(length=None)
     
     for job in jobs:
         job["_id"] = str(job["_id"])
-        # Add application count
-        job["total_applications"] = db.applications.count_documents({"job_id": str(job["_id"])})
+        job.setdefault("total_applications", 0)
     
     return jobs
 
 @app.get("/api/admin/company/{company_id}/applications")
-async def get_company_applications(company_id: str, current_user: dict = Depends(get_current_user)):
+async def get_company_applications(company_id: str, current_user: dict = Depends(get_current_user), page: PageParams = Depends(), versions: dict = conditional_get("recruiter:{company_id}")):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Get all jobs by this company first
-    company_jobs = list(db.jobs.find({"company_id": company_id}))
+    company_jobs = await db.jobs.find({"company_id": company_id, **ACTIVE}, {"_id": 1}).to_list(length=None)
     job_ids = [str(job["_id"]) for job in company_jobs]
     
-    # Get all applications for these jobs
-    applications = list(db.applications.find({"job_id": {"$in": job_ids}}))
+    # Get applications for these jobs, leaving out candidates being deleted
+    hidden = await deletions.hidden_user_ids(db)
+    applications = await page.fetch(db.applications, {"job_id": {"$in": job_ids}, "candidate_id": {"$nin": hidden}})
     
     for app in applications:
         app["_id"] = str(app["_id"])
     
-    return applications
+    return page.response(applications)
 
 @app.get("/api/admin/candidate/{candidate_id}/applications")
-async def get_candidate_applications_admin(candidate_id: str, current_user: dict = Depends(get_current_user)):
+async def get_candidate_applications_admin(candidate_id: str, current_user: dict = Depends(get_current_user), loaders: Loaders = Depends(get_loaders), versions: dict = conditional_get("candidate:{candidate_id}", JOBS)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    applications = list(db.applications.find({"candidate_id": candidate_id}))
+    applications = await db.applications.find({"candidate_id": candidate_id}).to_list(length=None)
     
-    for app in applications:
+    # Get job details for all applications in one query
+    jobs = await loaders.jobs.load_many([app["job_id"] for app in applications])
+    # Applications to jobs that are being deleted are left out
+    applications = [app for app, job in zip(applications, jobs) if job]
+    for app, job in zip(applications, filter(None, jobs)):
         app["_id"] = str(app["_id"])
-        # Get job details
-        job = db.jobs.find_one({"_id": ObjectId(app["job_id"])})
-        if job:
-            app["company_name"] = job.get("company_name", "N/A")
+        app["company_name"] = job.get("company_name", "N/A")
     
     return applications
 
@@ -384,42 +600,65 @@ async def get_candidate_applications_admin(candidate_id: str, current_user: dict
 
 # Recruiter routes
 @app.get("/api/recruiter/stats")
-async def get_recruiter_stats(current_user: dict = Depends(get_current_user)):
+async def get_recruiter_stats(current_user: dict = Depends(get_current_user), versions: dict = conditional_get("recruiter:{user_id}")):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     recruiter_id = str(current_user["_id"])
     
     # Get jobs posted by this recruiter
-    jobs = list(db.jobs.find({"company_id": recruiter_id}))
-    job_ids = [str(job["_id"]) for job in jobs]
+    jobs = await db.jobs.find({"company_id": recruiter_id, **ACTIVE}, {"created_at": 1}).to_list(length=None)
+    job_created = {str(job["_id"]): job.get("created_at") for job in jobs}
+    
+    # Count statuses and hire timings in the database; only one row per
+    # status and one per filled job come back
+    hired = {"status": "hired", "updated_at": {"$type": "date"}, "applied_at": {"$type": "date"}}
+    # Applicants whose accounts are being deleted are not counted
+    hidden = await deletions.hidden_user_ids(db)
+    result = await db.applications.aggregate([
+        {"$match": {"job_id": {"$in": list(job_created)}, "candidate_id": {"$nin": hidden}}},
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "time_to_hire": [
+                {"$match": hired},
+                {"$group": {"_id": None, "avg_ms": {"$avg": {"$subtract": ["$updated_at", "$applied_at"]}}}}
+            ],
+            "filled_jobs": [
+                {"$match": hired},
+                {"$group": {"_id": "$job_id", "filled_at": {"$min": "$updated_at"}}}
+            ]
+        }}
+    ]).to_list(length=None)
+    facets = result[0] if result else {"by_status": [], "time_to_hire": [], "filled_jobs": []}
+    
+    by_status = {row["_id"]: row["count"] for row in facets["by_status"]}
     
-    # Get applications for these jobs
-    applications = list(db.applications.find({"job_id": {"$in": job_ids}}))
+    ms_per_day = 1000 * 60 * 60 * 24
+    time_to_hire = 0
+    if facets["time_to_hire"] and facets["time_to_hire"][0]["avg_ms"] is not None:
+        time_to_hire = round(facets["time_to_hire"][0]["avg_ms"] / ms_per_day, 1)
     
-    total_applicants = len(applications)
-    shortlisted_candidates = len([app for app in applications if app["status"] == "approved"])
-    hired_candidates = len([app for app in applications if app["status"] == "hired"])
-    rejected_candidates = len([app for app in applications if app["status"] == "rejected"])
+    fill_days = [
+        (row["filled_at"] - job_created[row["_id"]]).total_seconds() / 86400
+        for row in facets["filled_jobs"]
+        if job_created.get(row["_id"])
+    ]
+    time_to_fill = round(sum(fill_days) / len(fill_days), 1) if fill_days else 0
     
     stats = {
-        "total_applicants": total_applicants,
-        "shortlisted_candidates": shortlisted_candidates,
-        "hired_candidates": hired_candidates,
-        "rejected_candidates": rejected_candidates,
-        "cost_per_hire": 17000,  # This could be calculated based on actual data
-        "time_to_hire": 15,
-        "time_to_fill": 26,
+        "total_applicants": sum(by_status.values()),
+        "shortlisted_candidates": by_status.get("approved", 0),
+        "hired_candidates": by_status.get("hired", 0),
+        "rejected_candidates": by_status.get("rejected", 0),
+        "cost_per_hire": RECRUITER_COST_PER_HIRE,
+        "time_to_hire": time_to_hire,
+        "time_to_fill": time_to_fill,
         "total_jobs": len(jobs)
     }
     return stats
 
-@app.post("/api/recruiter/jobs")
-async def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
-    if current_user["role"] != "recruiter":
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    job_doc = {
+def job_document(job: JobCreate, recruiter: dict):
+    return {
         "title": job.title,
         "skills_required": job.skills_required,
         "experience_years": job.experience_years,
@@ -427,107 +666,304 @@ async def create_job(job: JobCreate, current_user: dict = Depends(get_current_us
         "description": job.description,
         "location": job.location,
         "salary_range": job.salary_range,
-        "company_id": str(current_user["_id"]),
-        "company_name": current_user.get("company", ""),
-        "recruiter_name": current_user["name"],
+        "company_id": str(recruiter["_id"]),
+        "company_name": recruiter.get("company", ""),
+        "recruiter_name": recruiter["name"],
         "created_at": datetime.utcnow(),
-        "status": "open"
+        "status": "open",
+        **job_counters.empty_counters()
     }
+
+@app.post("/api/recruiter/jobs")
+async def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Not authorized")
     
-    result = db.jobs.insert_one(job_doc)
+    result = await db.jobs.insert_one(job_document(job, current_user))
+    open_jobs.invalidate()
+    await platform_stats.bump(db, jobs=1)
+    await resource_versions.bump(db, JOBS, resource_versions.recruiter(str(current_user["_id"])))
     return {"message": "Job created successfully", "job_id": str(result.inserted_id)}
 
+@app.post("/api/recruiter/jobs/import")
+async def import_jobs(file: UploadFile = File(...), format: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    fmt = bulk_import.detect_format(file.filename, format)
+    
+    async def record_batch(inserted):
+        await platform_stats.bump(db, jobs=inserted)
+    
+    report = await bulk_import.import_rows(
+        file, fmt, db.jobs,
+        lambda record: job_document(JobCreate.model_validate(record), current_user),
+        on_batch=record_batch
+    )
+    open_jobs.invalidate()
+    await resource_versions.bump(db, JOBS, resource_versions.recruiter(str(current_user["_id"])))
+    
+    return report
+
 @app.get("/api/recruiter/jobs")
-async def get_recruiter_jobs(current_user: dict = Depends(get_current_user)):
+async def get_recruiter_jobs(current_user: dict = Depends(get_current_user), page: PageParams = Depends(), versions: dict = conditional_get("recruiter:{user_id}")):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    jobs = list(db.jobs.find({"company_id": str(current_user["_id"])}))
+    # Application counts are maintained on the job documents
+    jobs = await page.fetch(db.jobs, {"company_id": str(current_user["_id"]), **ACTIVE})
     
-    # Add application count for each job
     for job in jobs:
         job["_id"] = str(job["_id"])
-        job_applications = db.applications.count_documents({"job_id": str(job["_id"])})
-        job["total_applications"] = job_applications
+        job.setdefault("total_applications", 0)
     
-    return jobs
+    return page.response(jobs)
 
 @app.delete("/api/recruiter/jobs/{job_id}")
 async def delete_job(job_id: str, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Check if job belongs to this recruiter
-    job = db.jobs.find_one({"_id": ObjectId(job_id), "company_id": str(current_user["_id"])})
-    if not job:
+    # Hide the job if it belongs to this recruiter; its applications are removed in the background
+    if not await deletions.soft_delete_job(db, job_id, str(current_user["_id"])):
         raise HTTPException(status_code=404, detail="Job not found")
+    open_jobs.invalidate()
+    job_cache.invalidate(job_id)
     
-    # Delete job and related applications
-    db.jobs.delete_one({"_id": ObjectId(job_id)})
-    db.applications.delete_many({"job_id": job_id})
+    deletion_job_id = await deletions.enqueue(db, "job", job_id, str(current_user["_id"]))
+    await resource_versions.bump(db, JOBS, APPLICATIONS, resource_versions.recruiter(str(current_user["_id"])))
     
-    return {"message": "Job deleted successfully"}
+    return {"message": "Job deleted successfully", "deletion_job_id": deletion_job_id}
 
 @app.get("/api/recruiter/applications/{job_id}")
-async def get_job_applications(job_id: str, current_user: dict = Depends(get_current_user)):
+async def get_job_applications(job_id: str, sort: Optional[str] = None, current_user: dict = Depends(get_current_user), loaders: Loaders = Depends(get_loaders)):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Verify job belongs to this recruiter
-    job = db.jobs.find_one({"_id": ObjectId(job_id), "company_id": str(current_user["_id"])})
+    job = await db.jobs.find_one({"_id": ObjectId(job_id), "company_id": str(current_user["_id"]), **ACTIVE})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get applications with candidate details
-    applications = list(db.applications.find({"job_id": job_id}))
+    applications = await db.applications.find({"job_id": job_id}).to_list(length=None)
     
-    for app in applications:
+    candidates = await loaders.users.load_many([app["candidate_id"] for app in applications])
+    
+    # Score applicants against the job when the recruiter has AI screening on
+    screening_enabled = current_user.get("recruitment_preferences", {}).get("enableAIScreening", True)
+    if sort == "score" and not screening_enabled:
+        raise HTTPException(status_code=400, detail="Enable AI screening to sort applicants by score")
+    scores = await screening.score_candidates(job, candidates) if screening_enabled else [None] * len(candidates)
+    
+    # Applicants whose accounts are being deleted are left out
+    visible = []
+    for app, candidate, score in zip(applications, candidates, scores):
+        if candidate is None:
+            continue
         app["_id"] = str(app["_id"])
-        # Get candidate details
-        candidate = db.users.find_one({"_id": ObjectId(app["candidate_id"])}, {"password": 0})
-        if candidate:
-            app["candidate_details"] = convert_objectid(candidate)
+        app["candidate_details"] = convert_objectid(candidate)
+        if score is not None:
+            app["screening_score"] = score
+        visible.append(app)
+    applications = visible
+    
+    if sort == "score":
+        applications.sort(key=lambda app: app["screening_score"], reverse=True)
     
     return applications
 
+@app.post("/api/recruiter/applications/bulk-status")
+async def bulk_update_application_status(update: BulkApplicationUpdate, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if update.status not in job_counters.APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    if (update.application_ids is None) == (update.job_id is None):
+        raise HTTPException(status_code=400, detail="Provide either application_ids or job_id")
+    
+    recruiter_id = str(current_user["_id"])
+    if update.application_ids is not None:
+        if len(update.application_ids) > application_status.BULK_STATUS_MAX_APPLICATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {application_status.BULK_STATUS_MAX_APPLICATIONS} applications can be updated at once"
+            )
+        query = {"_id": {"$in": application_status.object_ids(update.application_ids)}}
+        return await application_status.update_statuses(
+            db, recruiter_id, query, update.status, requested_ids=update.application_ids
+        )
+    
+    # Filter mode, e.g. every pending application for a job older than N days
+    if not ObjectId.is_valid(update.job_id) or not await db.jobs.find_one(
+        {"_id": ObjectId(update.job_id), "company_id": recruiter_id, **ACTIVE}, {"_id": 1}
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    query = {"job_id": update.job_id}
+    if update.current_status is not None:
+        query["status"] = update.current_status
+    if update.older_than_days is not None:
+        query["applied_at"] = {"$lt": datetime.utcnow() - timedelta(days=update.older_than_days)}
+    return await application_status.update_statuses(db, recruiter_id, query, update.status)
+
 @app.put("/api/recruiter/applications/{application_id}")
 async def update_application_status(application_id: str, update: ApplicationUpdate, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Update application status
-    result = db.applications.update_one(
-        {"_id": ObjectId(application_id)},
+    # Update application status, only on this recruiter's applications. An
+    # unchanged status is not written: updated_at dates the status change
+    # that time-to-hire is measured with
+    query = {"_id": ObjectId(application_id), "recruiter_id": str(current_user["_id"])}
+    previous = await db.applications.find_one_and_update(
+        {**query, "status": {"$ne": update.status}},
         {"$set": {"status": update.status, "updated_at": datetime.utcnow()}}
     )
     
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Application not found")
+    if previous is None:
+        if not await db.applications.find_one(query, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Application not found")
+        return {"message": "Application status updated successfully"}
+    
+    await job_counters.record_status_change(db, previous["job_id"], previous["status"], update.status)
+    await resource_versions.bump(
+        db, APPLICATIONS,
+        resource_versions.recruiter(str(current_user["_id"])),
+        resource_versions.candidate(previous.get("candidate_id"))
+    )
     
     return {"message": "Application status updated successfully"}
 
+@app.get("/api/recruiter/report")
+async def export_recruiter_report(format: str = "ndjson", current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "recruiter":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+    
+    # Stream straight from the aggregation cursor so memory stays flat
+    rows = reports.report_rows(db, str(current_user["_id"]))
+    if format == "csv":
+        body, media_type = reports.csv_report(rows), "text/csv"
+    else:
+        body, media_type = reports.ndjson_report(rows), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="recruitment-report.{format}"'}
+    )
+
 # Candidate routes
 @app.get("/api/candidate/jobs")
-async def get_available_jobs(current_user: dict = Depends(get_current_user)):
+async def get_available_jobs(current_user: dict = Depends(get_current_user), page: PageParams = Depends(), versions: dict = conditional_get(JOBS, "candidate:{user_id}")):
+    if current_user["role"] != "candidate":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Get open jobs from the shared snapshot (sorted newest first)
+    snapshot = page.slice(await open_jobs.get(db, versions[JOBS]))
+    candidate_id = str(current_user["_id"])
+    
+    # One query for this candidate's applications, keyed by job_id
+    applications = await db.applications.find(
+        {"candidate_id": candidate_id},
+        {"job_id": 1, "status": 1}
+    ).to_list(length=None)
+    applied = {app["job_id"]: app["status"] for app in applications}
+    
+    jobs = []
+    for snapshot_job in snapshot:
+        job = dict(snapshot_job)
+        job["has_applied"] = job["_id"] in applied
+        if job["has_applied"]:
+            job["application_status"] = applied[job["_id"]]
+        jobs.append(job)
+    
+    return page.response(jobs)
+
+def _valid_search_cursor(after, q):
+    """Whether a decoded search cursor has the sort keys of the current mode."""
+    if set(after) != ({"score", "_id"} if q else {"created_at", "_id"}) or not isinstance(after["_id"], ObjectId):
+        return False
+    if q:
+        return isinstance(after["score"], (int, float)) and not isinstance(after["score"], bool)
+    return after["created_at"] is None or isinstance(after["created_at"], datetime)
+
+@app.get("/api/candidate/jobs/search")
+async def search_jobs(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    max_experience: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get all open jobs
-    jobs = list(db.jobs.find({"status": "open"}))
+    limit = page_size(limit)
+    after = decode_cursor(cursor) if cursor else None
+    q = q.strip() if q else None
+    # e.g. a cursor from a search with a different q would fail mid-query
+    if after is not None and not _valid_search_cursor(after, q):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    match = {"status": "open", **ACTIVE}
+    if q:
+        match["$text"] = {"$search": q}
+    if location:
+        match["location"] = {"$regex": re.escape(location.strip()), "$options": "i"}
+    if max_experience is not None:
+        match["experience_years"] = {"$lte": max_experience}
+    
+    if q:
+        # Most relevant first, ties broken by _id
+        pipeline = [{"$match": match}, {"$addFields": {"score": {"$meta": "textScore"}}}]
+        if after:
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": after["score"]}},
+                {"score": after["score"], "_id": {"$gt": after["_id"]}}
+            ]}})
+        pipeline.append({"$sort": {"score": -1, "_id": 1}})
+    else:
+        # Newest first
+        if after:
+            match["$or"] = [
+                {"created_at": {"$lt": after["created_at"]}},
+                {"created_at": after["created_at"], "_id": {"$lt": after["_id"]}}
+            ]
+        pipeline = [{"$match": match}, {"$sort": {"created_at": -1, "_id": -1}}]
+    pipeline.append({"$limit": limit + 1})
+    
+    jobs = await db.jobs.aggregate(pipeline).to_list(length=None)
+    
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        if q:
+            next_cursor = encode_cursor({"score": last["score"], "_id": last["_id"]})
+        else:
+            next_cursor = encode_cursor({"created_at": last.get("created_at"), "_id": last["_id"]})
+    
+    # Overlay this candidate's applications for the jobs on this page only
     candidate_id = str(current_user["_id"])
+    job_ids = [str(job["_id"]) for job in jobs]
+    applications = await db.applications.find(
+        {"job_id": {"$in": job_ids}, "candidate_id": candidate_id},
+        {"job_id": 1, "status": 1}
+    ).to_list(length=None)
+    applied = {app["job_id"]: app["status"] for app in applications}
     
     for job in jobs:
         job["_id"] = str(job["_id"])
-        # Check if user already applied
-        existing_application = db.applications.find_one({
-            "job_id": str(job["_id"]),
-            "candidate_id": candidate_id
-        })
-        job["has_applied"] = bool(existing_application)
-        if existing_application:
-            job["application_status"] = existing_application["status"]
+        job["has_applied"] = job["_id"] in applied
+        if job["has_applied"]:
+            job["application_status"] = applied[job["_id"]]
     
-    return jobs
+    return {"items": jobs, "next_cursor": next_cursor}
 
 @app.post("/api/candidate/apply/{job_id}")
 async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_user)):
@@ -536,20 +972,11 @@ async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_us
     
     candidate_id = str(current_user["_id"])
     
-    # Check if job exists
-    job = db.jobs.find_one({"_id": ObjectId(job_id)})
+    # Title and owner come from the job cache, so popular jobs cost no lookup
+    job = await job_cache.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Check if already applied
-    existing_application = db.applications.find_one({
-        "job_id": job_id,
-        "candidate_id": candidate_id
-    })
-    
-    if existing_application:
-        raise HTTPException(status_code=400, detail="Already applied for this job")
-    
     application_doc = {
         "job_id": job_id,
         "job_title": job["title"],
@@ -561,25 +988,38 @@ async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_us
         "applied_at": datetime.utcnow()
     }
     
-    result = db.applications.insert_one(application_doc)
+    # The unique (job_id, candidate_id) index rejects a second application,
+    # even from concurrent requests
+    try:
+        result = await db.applications.insert_one(application_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied for this job")
+    await asyncio.gather(
+        job_counters.record_application(db, job_id, "pending"),
+        platform_stats.bump(db, applications=1),
+        resource_versions.bump(
+            db, APPLICATIONS, resource_versions.candidate(candidate_id), resource_versions.recruiter(job["company_id"])
+        ),
+    )
     return {"message": "Application submitted successfully", "application_id": str(result.inserted_id)}
 
 @app.get("/api/candidate/applications")
-async def get_candidate_applications(current_user: dict = Depends(get_current_user)):
+async def get_candidate_applications(current_user: dict = Depends(get_current_user), loaders: Loaders = Depends(get_loaders), page: PageParams = Depends()):
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     candidate_id = str(current_user["_id"])
-    applications = list(db.applications.find({"candidate_id": candidate_id}))
+    applications = await page.fetch(db.applications, {"candidate_id": candidate_id})
     
-    for app in applications:
+    # Get job details for all applications in one query
+    jobs = await loaders.jobs.load_many([app["job_id"] for app in applications])
+    # Applications to jobs that are being deleted are left out
+    applications = [app for app, job in zip(applications, jobs) if job]
+    for app, job in zip(applications, filter(None, jobs)):
         app["_id"] = str(app["_id"])
-        # Get job details
-        job = db.jobs.find_one({"_id": ObjectId(app["job_id"])})
-        if job:
-            app["job_details"] = convert_objectid(job)
+        app["job_details"] = convert_objectid(job)
     
-    return applications
+    return page.response(applications)
 
 @app.delete("/api/candidate/applications/{application_id}")
 async def withdraw_application(application_id: str, current_user: dict = Depends(get_current_user)):
@@ -588,8 +1028,8 @@ async def withdraw_application(application_id: str, current_user: dict = Depends
     
     candidate_id = str(current_user["_id"])
     
-    # Check if application belongs to this candidate
-    application = db.applications.find_one({
+    # Delete the application if it belongs to this candidate
+    application = await db.applications.find_one_and_delete({
         "_id": ObjectId(application_id),
         "candidate_id": candidate_id
     })
@@ -597,17 +1037,21 @@ async def withdraw_application(application_id: str, current_user: dict = Depends
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    # Delete the application
-    db.applications.delete_one({"_id": ObjectId(application_id)})
+    await job_counters.record_application(db, application["job_id"], application["status"], delta=-1)
+    await platform_stats.bump(db, applications=-1)
+    await resource_versions.bump(
+        db, APPLICATIONS, resource_versions.candidate(candidate_id),
+        resource_versions.recruiter(application.get("recruiter_id"))
+    )
     
     return {"message": "Application withdrawn successfully"}
 
 @app.get("/api/candidate/profile")
-async def get_candidate_profile(current_user: dict = Depends(get_current_user)):
+async def get_candidate_profile(current_user: dict = Depends(get_current_user), versions: dict = conditional_get("user:{user_id}")):
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    user = db.users.find_one({"_id": ObjectId(str(current_user["_id"]))}, {"password": 0})
+    user = await db.users.find_one({"_id": ObjectId(str(current_user["_id"]))}, {"password": 0})
     return convert_objectid(user)
 
 @app.put("/api/candidate/profile")
@@ -617,11 +1061,13 @@ async def update_candidate_profile(profile: CandidateProfile, current_user: dict
     
     candidate_id = str(current_user["_id"])
     
-    # Update profile
-    db.users.update_one(
+    # Update profile fields (keeping the picture) and recompute completion
+    await db.users.update_one(
         {"_id": ObjectId(candidate_id)},
-        {"$set": {"profile": profile.dict(), "updated_at": datetime.utcnow()}}
+        profiles.profile_update_pipeline(profile.dict(), extra={"updated_at": datetime.utcnow()})
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Profile updated successfully"}
 
@@ -632,21 +1078,31 @@ async def upload_profile_picture(file: UploadFile = File(...), current_user: dic
     
     candidate_id = str(current_user["_id"])
     
-    # Save uploaded file
-    file_extension = file.filename.split(".")[-1]
-    filename = f"{candidate_id}_profile.{file_extension}"
-    file_path = f"uploads/{filename}"
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Stream the upload into the blob store under its content hash
+    key = await blob_store.ingest(uploads, file)
+    file_path = f"/uploads/{key}"
     
     # Update user profile with image path
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(candidate_id)},
-        {"$set": {"profile.profile_picture": f"/uploads/{filename}"}}
+        profiles.profile_update_pipeline({"profile_picture": file_path}, extra={"updated_at": datetime.utcnow()})
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
+    
+    return {"message": "Profile picture uploaded successfully", "file_path": file_path}
+
+@app.get("/uploads/{key}")
+async def get_upload(key: str, request: Request):
+    return await upload_responses.blob_response(uploads, key, request)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    # Scrapers authenticate with METRICS_TOKEN when one is configured
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Not authorized")
     
-    return {"message": "Profile picture uploaded successfully", "file_path": f"/uploads/{filename}"}
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 
@@ -666,7 +1122,7 @@ async def update_recruiter_profile(profile_update: ProfileUpdate, current_user:
     
     # Check if email is already taken by another user
     if profile_update.email != current_user["email"]:
-        existing_user = db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(recruiter_id)}})
+        existing_user = await db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(recruiter_id)}})
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already in use by another account")
     
@@ -680,13 +1136,19 @@ async def update_recruiter_profile(profile_update: ProfileUpdate, current_user:
     if profile_update.company:
         update_data["company"] = profile_update.company
     
-    db.users.update_one(
-        {"_id": ObjectId(recruiter_id)},
-        {"$set": update_data}
-    )
+    # The unique email index catches a change racing a signup or another change
+    try:
+        await db.users.update_one(
+            {"_id": ObjectId(recruiter_id)},
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already in use by another account")
+    auth_cache.invalidate_user(current_user["email"], profile_update.email)
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     # ✅ Fetch updated user
-    updated_user = db.users.find_one({"_id": ObjectId(recruiter_id)}, {"password": 0})
+    updated_user = await db.users.find_one({"_id": ObjectId(recruiter_id)}, {"password": 0})
     updated_user = convert_objectid(updated_user)
 
     return {
@@ -701,17 +1163,20 @@ async def change_recruiter_password(password_change: PasswordChange, current_use
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Verify current password
-    if not verify_password(password_change.current_password, current_user["password"]):
+    stored = await db.users.find_one({"_id": current_user["_id"]}, {"password": 1})
+    if not stored or not await verify_password(password_change.current_password, stored.get("password")):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Hash new password
-    new_hashed_password = get_password_hash(password_change.new_password)
+    new_hashed_password = await get_password_hash(password_change.new_password)
     
     # Update password
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"password": new_hashed_password, "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Password changed successfully"}
 
@@ -720,10 +1185,12 @@ async def update_recruiter_notifications(settings: NotificationSettings, current
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"notification_settings": settings.dict(), "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Notification settings updated successfully"}
 
@@ -732,10 +1199,12 @@ async def update_recruiter_privacy(settings: PrivacySettings, current_user: dict
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"privacy_settings": settings.dict(), "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Privacy settings updated successfully"}
 
@@ -744,10 +1213,12 @@ async def update_recruiter_preferences(preferences: RecruiterPreferences, curren
     if current_user["role"] != "recruiter":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"recruitment_preferences": preferences.dict(), "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Preferences updated successfully"}
 
@@ -758,17 +1229,16 @@ async def delete_recruiter_account(current_user: dict = Depends(get_current_user
     
     recruiter_id = str(current_user["_id"])
     
-    # Delete recruiter account
-    db.users.delete_one({"_id": ObjectId(recruiter_id)})
+    # Hide the account and its jobs now; jobs and applications are removed in the background
+    await deletions.soft_delete_user(db, recruiter_id)
+    auth_cache.invalidate_user(current_user["email"])
+    open_jobs.invalidate()
+    job_cache.invalidate()
     
-    # Delete all jobs posted by this recruiter
-    jobs = list(db.jobs.find({"company_id": recruiter_id}))
-    job_ids = [str(job["_id"]) for job in jobs]
-    db.jobs.delete_many({"company_id": recruiter_id})
-    
-    # Delete all applications for these jobs
-    db.applications.delete_many({"job_id": {"$in": job_ids}})
+    await deletions.enqueue(db, "user", recruiter_id, recruiter_id)
+    await resource_versions.bump(db, USERS, JOBS, APPLICATIONS, *resource_versions.account(recruiter_id))
     
+    # No deletion_job_id: the account can no longer authenticate to poll it
     return {"message": "Recruiter account and all associated data deleted successfully"}
 
 # ========================================
@@ -784,7 +1254,7 @@ async def update_admin_profile(profile_update: ProfileUpdate, current_user: dict
     
     # Check if email is already taken by another user
     if profile_update.email != current_user["email"]:
-        existing_user = db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(admin_id)}})
+        existing_user = await db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(admin_id)}})
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already in use by another account")
     
@@ -795,12 +1265,18 @@ async def update_admin_profile(profile_update: ProfileUpdate, current_user: dict
         "updated_at": datetime.utcnow()
     }
     
-    db.users.update_one(
-        {"_id": ObjectId(admin_id)},
-        {"$set": update_data}
-    )
+    # The unique email index catches a change racing a signup or another change
+    try:
+        await db.users.update_one(
+            {"_id": ObjectId(admin_id)},
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already in use by another account")
+    auth_cache.invalidate_user(current_user["email"], profile_update.email)
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
-    updated_user = db.users.find_one({"_id": ObjectId(admin_id)}, {"password": 0})
+    updated_user = await db.users.find_one({"_id": ObjectId(admin_id)}, {"password": 0})
     updated_user = convert_objectid(updated_user)
 
     return {
@@ -814,17 +1290,20 @@ async def change_admin_password(password_change: PasswordChange, current_user: d
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Verify current password
-    if not verify_password(password_change.current_password, current_user["password"]):
+    stored = await db.users.find_one({"_id": current_user["_id"]}, {"password": 1})
+    if not stored or not await verify_password(password_change.current_password, stored.get("password")):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Hash new password
-    new_hashed_password = get_password_hash(password_change.new_password)
+    new_hashed_password = await get_password_hash(password_change.new_password)
     
     # Update password
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"password": new_hashed_password, "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Admin password changed successfully"}
 
@@ -834,10 +1313,12 @@ async def update_admin_notifications(settings: NotificationSettings, current_use
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Store admin notification settings in a separate collection or in user document
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"notification_settings": settings.dict(), "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Admin notification settings updated successfully"}
 
@@ -847,7 +1328,7 @@ async def update_system_settings(settings: SystemSettings, current_user: dict =
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Store system settings in a dedicated collection
-    db.system_settings.update_one(
+    await db.system_settings.update_one(
         {"type": "platform_settings"},
         {"$set": {**settings.dict(), "updated_at": datetime.utcnow(), "updated_by": str(current_user["_id"])}},
         upsert=True
@@ -861,7 +1342,7 @@ async def update_security_settings(settings: SecuritySettings, current_user: dic
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Store security settings in a dedicated collection
-    db.security_settings.update_one(
+    await db.security_settings.update_one(
         {"type": "security_config"},
         {"$set": {**settings.dict(), "updated_at": datetime.utcnow(), "updated_by": str(current_user["_id"])}},
         upsert=True
@@ -870,29 +1351,28 @@ async def update_security_settings(settings: SecuritySettings, current_user: dic
     return {"message": "Security settings updated successfully"}
 
 @app.post("/api/admin/system-backup")
-async def create_system_backup(current_user: dict = Depends(get_current_user)):
+async def create_system_backup(incremental: bool = False, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    try:
-        # Create backup record
-        backup_record = {
-            "backup_id": f"backup_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "created_at": datetime.utcnow(),
-            "created_by": str(current_user["_id"]),
-            "status": "completed",
-            "type": "manual",
-            "collections_backed_up": [
-                "users", "jobs", "applications", "system_settings", "security_settings"
-            ]
-        }
-        
-        db.backups.insert_one(backup_record)
-        
-        return {"message": "System backup completed successfully", "backup_id": backup_record["backup_id"]}
+    # Export runs in the background; poll the status endpoint for progress
+    backup = await backups.start_backup(db, str(current_user["_id"]), incremental=incremental)
+    task = asyncio.create_task(backups.run_backup(db, backup))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
+    return {"message": "System backup started", "backup_id": backup["backup_id"], "mode": backup["mode"]}
+
+@app.get("/api/admin/system-backup/{backup_id}")
+async def get_system_backup(backup_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    backup = await db.backups.find_one({"backup_id": backup_id})
+    if backup is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    
+    return convert_objectid(backup)
 
 # ========================================
 # CANDIDATE SETTINGS ENDPOINTS (if missing)
@@ -907,7 +1387,7 @@ async def update_candidate_basic_profile(profile_update: ProfileUpdate, current_
     
     # Check if email is already taken by another user
     if profile_update.email != current_user["email"]:
-        existing_user = db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(candidate_id)}})
+        existing_user = await db.users.find_one({"email": profile_update.email, "_id": {"$ne": ObjectId(candidate_id)}})
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already in use by another account")
     
@@ -918,12 +1398,18 @@ async def update_candidate_basic_profile(profile_update: ProfileUpdate, current_
         "updated_at": datetime.utcnow()
     }
     
-    db.users.update_one(
-        {"_id": ObjectId(candidate_id)},
-        {"$set": update_data}
-    )
+    # The unique email index catches a change racing a signup or another change
+    try:
+        await db.users.update_one(
+            {"_id": ObjectId(candidate_id)},
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already in use by another account")
+    auth_cache.invalidate_user(current_user["email"], profile_update.email)
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
-    updated_user = db.users.find_one({"_id": ObjectId(candidate_id)}, {"password": 0})
+    updated_user = await db.users.find_one({"_id": ObjectId(candidate_id)}, {"password": 0})
     updated_user = convert_objectid(updated_user)
 
     return {
@@ -938,17 +1424,20 @@ async def change_candidate_password(password_change: PasswordChange, current_use
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Verify current password
-    if not verify_password(password_change.current_password, current_user["password"]):
+    stored = await db.users.find_one({"_id": current_user["_id"]}, {"password": 1})
+    if not stored or not await verify_password(password_change.current_password, stored.get("password")):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Hash new password
-    new_hashed_password = get_password_hash(password_change.new_password)
+    new_hashed_password = await get_password_hash(password_change.new_password)
     
     # Update password
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"password": new_hashed_password, "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Password changed successfully"}
 
@@ -957,10 +1446,12 @@ async def update_candidate_notifications(settings: NotificationSettings, current
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"notification_settings": settings.dict(), "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Notification settings updated successfully"}
 
@@ -969,10 +1460,12 @@ async def update_candidate_privacy(settings: dict, current_user: dict = Depends(
     if current_user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    db.users.update_one(
+    await db.users.update_one(
         {"_id": ObjectId(str(current_user["_id"]))},
         {"$set": {"privacy_settings": settings, "updated_at": datetime.utcnow()}}
     )
+    auth_cache.invalidate_user(current_user["email"])
+    await resource_versions.bump(db, USERS, resource_versions.user(str(current_user["_id"])))
     
     return {"message": "Privacy settings updated successfully"}
 
@@ -983,12 +1476,18 @@ async def delete_candidate_account(current_user: dict = Depends(get_current_user
     
     candidate_id = str(current_user["_id"])
     
-    # Delete candidate account
-    db.users.delete_one({"_id": ObjectId(candidate_id)})
+    # Hide the account now; applications are removed in the background
+    await deletions.soft_delete_user(db, candidate_id)
+    auth_cache.invalidate_user(current_user["email"])
     
-    # Delete all applications by this candidate
-    db.applications.delete_many({"candidate_id": candidate_id})
+    affected_recruiters = await db.applications.distinct("recruiter_id", {"candidate_id": candidate_id})
+    await deletions.enqueue(db, "user", candidate_id, candidate_id)
+    await resource_versions.bump(
+        db, USERS, APPLICATIONS, *resource_versions.account(candidate_id),
+        *map(resource_versions.recruiter, affected_recruiters)
+    )
     
+    # No deletion_job_id: the account can no longer authenticate to poll it
     return {"message": "Candidate account and all associated data deleted successfully"}
 
 
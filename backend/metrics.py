@@ -0,0 +1,334 @@
+"""Request and MongoDB metrics in the Prometheus text format.
+
+MetricsMiddleware times every request under its route template (so
+`/api/recruiter/applications/{job_id}` is one series, not one per job) and
+counts the MongoDB commands the request issued: the command listener
+attributes each command to the request through a context variable, which
+Motor copies into its executor threads. The pool listener tracks open and
+checked-out connections and checkout waits.
+
+Requests slower than SLOW_REQUEST_MS or issuing more than
+DB_COMMAND_BUDGET commands are logged with the shapes of their queries
+(values replaced by `?`), which makes N+1 patterns easy to spot.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter as Tally
+
+from decouple import config
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = config("SLOW_REQUEST_MS", default=1000, cast=int)
+DB_COMMAND_BUDGET = config("DB_COMMAND_BUDGET", default=25, cast=int)
+# Distinct query shapes kept per request for the slow request log
+MAX_RECORDED_SHAPES = 200
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Unmatched paths share one series so scanners cannot blow up the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Skipped in query shapes: they are not part of the query
+_COMMAND_NOISE = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "cursor", "batchSize"}
+
+_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels, value):
+        with _lock:
+            self.values[labels] = value
+
+
+INF_BUCKET = 'le="+Inf"'
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, description, buckets, labels=()):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.label_names = labels
+        # labels -> [count per bucket..., sum, count]
+        self.values = {}
+
+    def observe(self, *labels, value):
+        with _lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        for labels, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series):
+                bucket = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, bucket)} {count}"
+            yield f"{self.name}_bucket{_labels(self.label_names, labels, INF_BUCKET)} {series[-1]}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}"
+
+
+ROUTE_LABELS = ("method", "route")
+
+requests_total = Counter("http_requests_total", "Requests by route and status code.", ROUTE_LABELS + ("status",))
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS, ROUTE_LABELS
+)
+request_db_commands = Histogram(
+    "http_request_db_commands", "MongoDB commands issued per request.", COMMAND_COUNT_BUCKETS, ROUTE_LABELS
+)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent in MongoDB commands per request.", LATENCY_BUCKETS, ROUTE_LABELS
+)
+requests_in_flight = Gauge("http_requests_in_flight", "Requests being handled.")
+over_budget_requests = Counter(
+    "http_requests_over_budget_total", "Requests over the latency or DB command budget.", ROUTE_LABELS
+)
+mongo_commands = Counter("mongodb_commands_total", "MongoDB commands by name.", ("command",))
+mongo_command_failures = Counter("mongodb_command_failures_total", "Failed MongoDB commands by name.", ("command",))
+pool_connections = Gauge("mongodb_pool_connections", "Open connections in the MongoDB pools.")
+pool_connections_in_use = Gauge("mongodb_pool_connections_in_use", "Connections checked out of the MongoDB pools.")
+pool_checkout_wait = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", LATENCY_BUCKETS
+)
+pool_checkout_failures = Counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection checkouts by reason.", ("reason",)
+)
+
+REGISTRY = [
+    requests_total, request_duration, request_db_commands, request_db_duration, requests_in_flight,
+    over_budget_requests, mongo_commands, mongo_command_failures, pool_connections, pool_connections_in_use,
+    pool_checkout_wait, pool_checkout_failures,
+]
+
+requests_in_flight.set(value=0)
+pool_connections.set(value=0)
+pool_connections_in_use.set(value=0)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for metric in REGISTRY:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    def __init__(self):
+        self.commands = 0
+        self.db_seconds = 0.0
+        # Query shape -> count, for the slow request log. Only shapes are kept:
+        # insert commands carry their whole document batch
+        self.shapes = Tally()
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def _shape(value):
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        # Operator lists ($and, $or, pipelines) keep their structure
+        if value and all(isinstance(item, dict) for item in value):
+            return [_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def query_shape(name, collection, command):
+    """`find users {"email": "?"}`: the command with its values masked."""
+    if name == "aggregate":
+        body = [_shape(stage) for stage in command.get("pipeline", [])]
+    elif name in ("update", "delete"):
+        statements = command.get("updates" if name == "update" else "deletes") or [{}]
+        body = _shape(statements[0].get("q", {}))
+    elif name in ("findAndModify", "count"):
+        body = _shape(command.get("query", {}))
+    elif name == "distinct":
+        body = {"key": command.get("key"), "query": _shape(command.get("query", {}))}
+    elif name == "find":
+        body = {key: _shape(command[key]) for key in ("filter", "sort", "projection") if key in command}
+    else:
+        body = {key: "?" for key in command if key not in _COMMAND_NOISE and key != name}
+    return f"{name} {collection} {body}"
+
+
+class CommandListener(monitoring.CommandListener):
+    def started(self, event):
+        stats = _current.get()
+        if stats is None:
+            return
+        collection = event.command.get(event.command_name)
+        shape = query_shape(event.command_name, collection if isinstance(collection, str) else "", event.command)
+        if shape in stats.shapes or len(stats.shapes) < MAX_RECORDED_SHAPES:
+            stats.shapes[shape] += 1
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+        mongo_command_failures.inc(event.command_name)
+
+    def _finished(self, event):
+        mongo_commands.inc(event.command_name)
+        stats = _current.get()
+        if stats is not None:
+            stats.commands += 1
+            stats.db_seconds += event.duration_micros / 1e6
+
+
+class PoolListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._checkouts = threading.local()
+
+    def _add(self, gauge, amount):
+        with _lock:
+            gauge.values[()] += amount
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add(pool_connections, 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(pool_connections, -1)
+
+    def connection_check_out_started(self, event):
+        self._checkouts.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        pool_checkout_failures.inc(event.reason)
+
+    def connection_checked_out(self, event):
+        started = getattr(self._checkouts, "started", None)
+        if started is not None:
+            pool_checkout_wait.observe(value=time.perf_counter() - started)
+            self._checkouts.started = None
+        self._add(pool_connections_in_use, 1)
+
+    def connection_checked_in(self, event):
+        self._add(pool_connections_in_use, -1)
+
+
+# Passed to every client by database.create_client
+listeners = [CommandListener(), PoolListener()]
+
+
+def _log_over_budget(method, route, status, seconds, stats):
+    logger.warning(
+        "%s %s -> %s took %.0f ms with %d MongoDB command(s) (%.0f ms):\n%s",
+        method, route, status, seconds * 1000, stats.commands, stats.db_seconds * 1000,
+        "\n".join(f"  {count:4d} x {shape}" for shape, count in stats.shapes.most_common()),
+    )
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the metrics above for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight(1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight(-1)
+            _current.reset(token)
+            seconds = time.perf_counter() - started
+            # The router stores the matched route on the scope
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            requests_total.inc(*labels, str(status))
+            request_duration.observe(*labels, value=seconds)
+            request_db_commands.observe(*labels, value=stats.commands)
+            request_db_duration.observe(*labels, value=stats.db_seconds)
+            if seconds * 1000 > SLOW_REQUEST_MS or stats.commands > DB_COMMAND_BUDGET:
+                over_budget_requests.inc(*labels)
+                _log_over_budget(*labels, status, seconds, stats)
+
+    @staticmethod
+    def _in_flight(amount):
+        with _lock:
+            requests_in_flight.values[()] += amount
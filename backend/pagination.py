@@ -0,0 +1,84 @@
+import base64
+from itertools import islice
+from typing import Optional
+
+from bson import ObjectId, json_util
+from pymongo import DESCENDING
+from decouple import config
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = config("DEFAULT_PAGE_SIZE", default=20, cast=int)
+# Server-enforced ceiling; larger `limit` values are clamped to it
+MAX_PAGE_SIZE = config("MAX_PAGE_SIZE", default=100, cast=int)
+
+
+def page_size(limit):
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last returned item as an opaque token."""
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+# Opt-in for clients that predate paging: requests passing neither `limit`
+# nor `cursor` then get the old unpaginated (and unbounded) list shape.
+# Off by default, so every list response is a page of at most MAX_PAGE_SIZE.
+LEGACY_LIST_RESPONSES = config("LEGACY_LIST_RESPONSES", default=False, cast=bool)
+
+
+class PageParams:
+    """Keyset pagination over `_id`, newest first; use as `page: PageParams = Depends()`.
+
+    Paged responses have the shape {"items": [...], "next_cursor": ...}.
+    """
+
+    def __init__(self, limit: Optional[int] = None, cursor: Optional[str] = None):
+        self.limit = page_size(limit)
+        self.after = decode_cursor(cursor).get("_id") if cursor else None
+        if cursor and not isinstance(self.after, ObjectId):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        self.paginated = not LEGACY_LIST_RESPONSES or limit is not None or cursor is not None
+        self.next_cursor = None
+
+    async def fetch(self, collection, query, projection=None):
+        if not self.paginated:
+            return await collection.find(query, projection).to_list(length=None)
+        if self.after is not None:
+            query = {"$and": [query, {"_id": {"$lt": self.after}}]}
+        docs = await collection.find(query, projection).sort("_id", DESCENDING).limit(self.limit + 1).to_list(length=None)
+        return self._trim(docs)
+
+    def slice(self, items):
+        """Page through an in-memory list already sorted by `_id` descending."""
+        if not self.paginated:
+            return list(items)
+        if self.after is not None:
+            after = str(self.after)
+            items = (item for item in items if str(item["_id"]) < after)
+        return self._trim(list(islice(items, self.limit + 1)))
+
+    def _trim(self, docs):
+        if len(docs) > self.limit:
+            docs = docs[:self.limit]
+            self.next_cursor = encode_cursor({"_id": ObjectId(str(docs[-1]["_id"]))})
+        return docs
+
+    def response(self, items):
+        if not self.paginated:
+            return items
+        return {"items": items, "next_cursor": self.next_cursor}
@@ -0,0 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from decouple import config
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# bcrypt cost factor for new hashes; existing hashes with a different cost are
+# upgraded transparently on the next successful login.
+BCRYPT_ROUNDS = config("BCRYPT_ROUNDS", default=12, cast=int)
+# Threads dedicated to bcrypt work (the bcrypt C extension releases the GIL)
+PASSWORD_WORKERS = config("PASSWORD_WORKERS", default=4, cast=int)
+# Maximum hash/verify calls waiting for a worker before new ones are rejected
+PASSWORD_QUEUE_LIMIT = config("PASSWORD_QUEUE_LIMIT", default=64, cast=int)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending >= PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def verify_password(plain_password, hashed_password):
+    if not hashed_password:
+        return False
+    return await _run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash(password):
+    return await _run(pwd_context.hash, password)
+
+
+def needs_rehash(hashed_password):
+    return pwd_context.needs_update(hashed_password)
+
+
+def shutdown():
+    _executor.shutdown(wait=False)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# How often the counters are recomputed from the collections to correct drift
+PLATFORM_STATS_RECONCILE_SECONDS = config("PLATFORM_STATS_RECONCILE_SECONDS", default=600, cast=int)
+
+STATS_ID = "platform"
+ROLES = ("admin", "recruiter", "candidate")
+
+
+async def bump(db, role=None, users=0, jobs=0, applications=0):
+    """Apply incremental changes to the platform counters."""
+    inc = {}
+    if users:
+        inc["total_users"] = users
+        if role in ROLES:
+            inc[f"users_by_role.{role}"] = users
+    if jobs:
+        inc["total_jobs"] = jobs
+    if applications:
+        inc["total_applications"] = applications
+    if inc:
+        await db.platform_stats.update_one({"_id": STATS_ID}, {"$inc": inc}, upsert=True)
+
+
+async def reconcile(db):
+    """Recompute every counter from the source collections.
+
+    Soft-deleted users and jobs are not counted; applications are, until the
+    background cascade removes them.
+    """
+    roles = await db.users.aggregate([
+        {"$match": {"deleted_at": None}},
+        {"$group": {"_id": "$role", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    by_role = {role: 0 for role in ROLES}
+    for row in roles:
+        if row["_id"] in ROLES:
+            by_role[row["_id"]] = row["count"]
+    stats = {
+        "users_by_role": by_role,
+        "total_users": sum(row["count"] for row in roles),
+        "total_jobs": await db.jobs.count_documents({"deleted_at": None}),
+        "total_applications": await db.applications.count_documents({}),
+        "reconciled_at": datetime.utcnow(),
+    }
+    await db.platform_stats.update_one({"_id": STATS_ID}, {"$set": stats}, upsert=True)
+    return stats
+
+
+async def get_stats(db):
+    stats = await db.platform_stats.find_one({"_id": STATS_ID})
+    if stats is None or "reconciled_at" not in stats:
+        stats = await reconcile(db)
+    return stats
+
+
+async def run_reconciliation(db, interval=PLATFORM_STATS_RECONCILE_SECONDS):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile(db)
+        except Exception:
+            logger.exception("Platform stats reconciliation failed")
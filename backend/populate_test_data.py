@@ -132,7 +132,7 @@ def create_sample_jobs(recruiter_id):
     print(f"Created {len(jobs_data)} sample jobs")
     return job_ids
 
-def create_sample_applications(candidate_id, job_ids):
+def create_sample_applications(candidate_id, recruiter_id, job_ids):
     """Create sample job applications"""
     
     applications_data = [
@@ -142,7 +142,7 @@ def create_sample_applications(candidate_id, job_ids):
             "candidate_id": candidate_id,
             "candidate_name": "Jane Doe",
             "candidate_email": "candidate@email.com",
-            "recruiter_id": job_ids[0],  # This should be recruiter_id, but using job_id for simplicity
+            "recruiter_id": recruiter_id,
             "status": "pending",
             "applied_at": datetime.utcnow()
         },
@@ -152,7 +152,7 @@ def create_sample_applications(candidate_id, job_ids):
             "candidate_id": candidate_id,
             "candidate_name": "Jane Doe",
             "candidate_email": "candidate@email.com",
-            "recruiter_id": job_ids[1],
+            "recruiter_id": recruiter_id,
             "status": "approved",
             "applied_at": datetime.utcnow()
         }
@@ -176,7 +176,7 @@ def main():
     job_ids = create_sample_jobs(recruiter_id)
     
     # Create sample applications
-    create_sample_applications(candidate_id, job_ids)
+    create_sample_applications(candidate_id, recruiter_id, job_ids)
     
     print("\nSample data created successfully!")
     print("\nLogin credentials:")
@@ -184,6 +184,7 @@ def main():
     print("Recruiter: recruiter@company.com / password123")
     print("Candidate: candidate@email.com / password123")
     print("\nCheck MongoDB Compass - you should now see all 3 collections!")
+    print("For larger data sets use generate_data.py")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Stored candidate profile completion.
+
+`profile_completion` (0-100) is kept on candidate user documents and updated
+whenever the profile changes. Run this module directly to backfill it for
+existing candidates:
+
+    python profiles.py
+"""
+import asyncio
+
+# Each filled-in section is worth 20%. completion_expression() mirrors
+# profile_completion() for server-side updates; keep the two in sync.
+COMPLETION_SECTIONS = ("bio", "skills", "experience", "education", "profile_picture")
+
+
+def profile_completion(profile):
+    profile = profile or {}
+    return sum(20 for section in COMPLETION_SECTIONS if profile.get(section))
+
+
+def completion_expression():
+    """Aggregation expression computing profile_completion from the stored profile."""
+    def filled_text(field):
+        return {"$cond": [{"$gt": [{"$strLenCP": {"$ifNull": [f"$profile.{field}", ""]}}, 0]}, 20, 0]}
+
+    def filled_list(field):
+        return {"$cond": [{"$gt": [{"$size": {"$ifNull": [f"$profile.{field}", []]}}, 0]}, 20, 0]}
+
+    return {"$add": [
+        filled_text("bio"),
+        filled_list("skills"),
+        filled_list("experience"),
+        filled_list("education"),
+        filled_text("profile_picture"),
+    ]}
+
+
+def profile_update_pipeline(fields, extra=None):
+    """Update pipeline that sets profile fields and recomputes completion atomically.
+
+    `extra` holds additional top-level fields to set alongside the profile.
+    """
+    updates = {f"profile.{key}": {"$literal": value} for key, value in fields.items()}
+    updates.update({key: {"$literal": value} for key, value in (extra or {}).items()})
+    return [
+        {"$set": updates},
+        {"$set": {"profile_completion": completion_expression()}},
+    ]
+
+
+async def backfill_completion(db):
+    result = await db.users.update_many(
+        {"role": "candidate"},
+        [{"$set": {"profile_completion": completion_expression()}}]
+    )
+    return result.modified_count
+
+
+async def _main():
+    from database import client, db
+
+    try:
+        modified = await backfill_completion(db)
+        print(f"Profile completion updated for {modified} candidate(s)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
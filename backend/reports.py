@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+import deletions
+
+REPORT_BATCH_SIZE = 500
+
+CSV_COLUMNS = [
+    "Job Title", "Skills Required", "Experience", "Location", "Salary", "Posted Date", "Status",
+    "Candidate Name", "Candidate Email", "Application Date", "Application Status", "Candidate Skills",
+]
+
+
+def _report_pipeline(recruiter_id, hidden):
+    """One row per (job, application); jobs without applications yield a single row.
+
+    Applications of the `hidden` (soft-deleted) candidates are left out.
+    """
+    return [
+        {"$match": {"company_id": recruiter_id, "deleted_at": None}},
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$addFields": {"job_id": {"$toString": "$_id"}}},
+        {"$lookup": {
+            "from": "applications",
+            "localField": "job_id",
+            "foreignField": "job_id",
+            "pipeline": [{"$match": {"candidate_id": {"$nin": hidden}}}],
+            "as": "application",
+        }},
+        # $lookup immediately followed by $unwind is coalesced by the server,
+        # so a job's applications are never materialized as one array
+        {"$unwind": {"path": "$application", "preserveNullAndEmptyArrays": True}},
+        {"$addFields": {"candidate_oid": {"$convert": {
+            "input": "$application.candidate_id", "to": "objectId", "onError": None, "onNull": None,
+        }}}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "candidate_oid",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {
+                "profile.skills": 1, "profile.experience": 1, "profile.education": 1, "profile.bio": 1,
+            }}],
+            "as": "candidate",
+        }},
+        {"$project": {
+            "job_id": 1, "title": 1, "skills_required": 1, "experience_years": 1, "qualification": 1,
+            "location": 1, "salary_range": 1, "created_at": 1, "status": 1,
+            "total_applications": 1, "status_counts": 1,
+            "application.candidate_name": 1, "application.candidate_email": 1,
+            "application.applied_at": 1, "application.status": 1,
+            "candidate": {"$first": "$candidate"},
+        }},
+    ]
+
+
+async def _hidden_counts(db, recruiter_id, hidden):
+    """job_id -> {status: count} of the recruiter's applications from hidden candidates."""
+    groups = await db.applications.aggregate([
+        {"$match": {"recruiter_id": recruiter_id, "candidate_id": {"$in": hidden}}},
+        {"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "count": {"$sum": 1}}},
+    ]).to_list(length=None)
+    counts = {}
+    for group in groups:
+        counts.setdefault(group["_id"]["job_id"], {})[group["_id"]["status"]] = group["count"]
+    return counts
+
+
+def _without_hidden(row, hidden_counts):
+    # The job counters still include them until the deletion cascade runs
+    status_counts = dict(row.get("status_counts") or {})
+    for status, count in hidden_counts.items():
+        if status in status_counts:
+            status_counts[status] = max(status_counts[status] - count, 0)
+    total = max(row.get("total_applications", 0) - sum(hidden_counts.values()), 0)
+    return {**row, "total_applications": total, "status_counts": status_counts}
+
+
+async def report_rows(db, recruiter_id):
+    # Soft-deleted candidates' applications remain until the cascade removes
+    # them; rows and job counts both leave them out
+    hidden = await deletions.hidden_user_ids(db)
+    hidden_counts = await _hidden_counts(db, recruiter_id, hidden) if hidden else {}
+    cursor = db.jobs.aggregate(_report_pipeline(recruiter_id, hidden), batchSize=REPORT_BATCH_SIZE)
+    async for row in cursor:
+        if row["job_id"] in hidden_counts:
+            row = _without_hidden(row, hidden_counts[row["job_id"]])
+        yield row
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _line(record):
+    return json.dumps(record, default=_json_default) + "\n"
+
+
+async def ndjson_report(rows):
+    """A `job` line when a new job starts, followed by one `application` line per applicant."""
+    current_job = None
+    async for row in rows:
+        if row["job_id"] != current_job:
+            current_job = row["job_id"]
+            counts = row.get("status_counts", {})
+            yield _line({
+                "type": "job",
+                "job_id": row["job_id"],
+                "job_title": row.get("title"),
+                "skills_required": row.get("skills_required"),
+                "experience_years": row.get("experience_years"),
+                "qualification": row.get("qualification"),
+                "location": row.get("location"),
+                "salary_range": row.get("salary_range"),
+                "posted_date": row.get("created_at"),
+                "status": row.get("status"),
+                "total_applications": row.get("total_applications", 0),
+                "pending_applications": counts.get("pending", 0),
+                "approved_applications": counts.get("approved", 0),
+                "rejected_applications": counts.get("rejected", 0),
+                "hired_applications": counts.get("hired", 0),
+            })
+        application = row.get("application")
+        if not application:
+            continue
+        profile = (row.get("candidate") or {}).get("profile")
+        yield _line({
+            "type": "application",
+            "job_id": row["job_id"],
+            "name": application.get("candidate_name"),
+            "email": application.get("candidate_email"),
+            "application_date": application.get("applied_at"),
+            "current_status": application.get("status"),
+            "profile_summary": {
+                "skills": profile.get("skills", []),
+                "experience": profile.get("experience", []),
+                "education": profile.get("education", []),
+                "bio": profile.get("bio") or "Not provided",
+            } if profile else None,
+        })
+
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if isinstance(value, datetime) else ""
+
+
+async def csv_report(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+    async for row in rows:
+        job_columns = [
+            row.get("title"), row.get("skills_required"), f"{row.get('experience_years')} years",
+            row.get("location") or "N/A", row.get("salary_range") or "N/A",
+            _date(row.get("created_at")), row.get("status"),
+        ]
+        application = row.get("application")
+        if not application:
+            writer.writerow(job_columns + ["No applications", "", "", "", ""])
+        else:
+            profile = (row.get("candidate") or {}).get("profile") or {}
+            skills = "; ".join(profile.get("skills", [])) or "N/A"
+            writer.writerow(job_columns + [
+                application.get("candidate_name"), application.get("candidate_email"),
+                _date(application.get("applied_at")), application.get("status"), skills,
+            ])
+        yield flush()
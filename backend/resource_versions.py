@@ -0,0 +1,88 @@
+"""Change counters behind conditional GETs.
+
+Write endpoints bump a counter for every scope they touch: a collection-wide
+scope ("users", "jobs", "applications") or an owner scope such as
+"recruiter:<id>", "candidate:<id>" or "user:<id>". Read endpoints derive a
+weak ETag from the counters of the scopes their payload depends on, so an
+`If-None-Match` request is answered with a single lookup on
+`resource_versions` instead of the full query. The counters live in MongoDB
+so every API process agrees on them.
+"""
+import hashlib
+
+from fastapi import HTTPException, Request, Response
+from pymongo import UpdateOne
+
+USERS = "users"
+JOBS = "jobs"
+APPLICATIONS = "applications"
+# Part of every tag; bumped when data changes behind the write paths
+EPOCH = "epoch"
+
+
+# Owner scopes; a missing id yields None, which bump() ignores
+def recruiter(recruiter_id):
+    return f"recruiter:{recruiter_id}" if recruiter_id else None
+
+
+def candidate(candidate_id):
+    return f"candidate:{candidate_id}" if candidate_id else None
+
+
+def user(user_id):
+    return f"user:{user_id}" if user_id else None
+
+
+def account(user_id):
+    """Every owner scope of a user, for account-level changes such as deletion."""
+    return [user(user_id), recruiter(user_id), candidate(user_id)]
+
+
+async def bump(db, *scopes):
+    scopes = {scope for scope in scopes if scope}
+    if scopes:
+        await db.resource_versions.bulk_write(
+            [UpdateOne({"_id": scope}, {"$inc": {"v": 1}}, upsert=True) for scope in sorted(scopes)],
+            ordered=False
+        )
+
+
+async def invalidate_all(db):
+    """Make every issued tag stale, e.g. after a restore replaced data.
+
+    The collection scopes are bumped too, so snapshots keyed on them reload.
+    """
+    await bump(db, EPOCH, USERS, JOBS, APPLICATIONS)
+
+
+async def get_versions(db, scopes):
+    docs = await db.resource_versions.find({"_id": {"$in": list(scopes)}}).to_list(length=None)
+    versions = {scope: 0 for scope in scopes}
+    versions.update({doc["_id"]: doc.get("v", 0) for doc in docs})
+    return versions
+
+
+def etag(request: Request, viewer_id, versions):
+    # Path and query distinguish pages and filters; the viewer keeps one
+    # user's tag from matching another user's payload
+    key = "|".join([
+        request.url.path, str(request.url.query), str(viewer_id),
+        *(f"{scope}={version}" for scope, version in sorted(versions.items())),
+    ])
+    return 'W/"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+async def check(db, request: Request, response: Response, scopes, viewer_id):
+    """Raise 304 when the client's tag is current; otherwise tag the response.
+
+    Versions are read before the handler queries, so a concurrent write can
+    only make a tag older than its payload, never newer.
+    """
+    versions = await get_versions(db, [*scopes, EPOCH])
+    tag = etag(request, viewer_id, versions)
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if tag in [value.strip() for value in if_none_match.split(",")] or if_none_match.strip() == "*":
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return versions
@@ -0,0 +1,177 @@
+import asyncio
+import re
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+from decouple import config
+
+from cache import LRUCache
+
+SCREENING_CACHE_SIZE = config("SCREENING_CACHE_SIZE", default=200000, cast=int)
+
+# Relative weight of each criterion in the 0-100 score
+SKILLS_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+QUALIFICATION_WEIGHT = 0.15
+
+_STOPWORDS = {"a", "an", "and", "the", "in", "of", "or", "related", "degree", "field", "with", "s"}
+_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+_YEAR_RANGE_RE = re.compile(r"((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current|now)")
+_YEARS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:\+\s*)?(?:years?|yrs?)")
+
+# (job signature, candidate_id, profile version) -> score
+_scores = LRUCache(maxsize=SCREENING_CACHE_SIZE)
+
+
+# Profiles repeat the same skills, degrees and durations heavily, so the text
+# normalisation steps are memoized
+@lru_cache(maxsize=65536)
+def _normalize_skill(skill):
+    return " ".join(skill.lower().split())
+
+
+@lru_cache(maxsize=65536)
+def _words(text):
+    return frozenset(word.strip(".") for word in _WORD_RE.findall(text.lower())) - _STOPWORDS - {""}
+
+
+@lru_cache(maxsize=65536)
+def _duration_years(duration):
+    duration = duration.lower()
+    match = _YEAR_RANGE_RE.search(duration)
+    if match:
+        start = int(match.group(1))
+        end = datetime.utcnow().year if match.group(2) in ("present", "current", "now") else int(match.group(2))
+        return max(end - start, 0)
+    match = _YEARS_RE.search(duration)
+    return float(match.group(1)) if match else 0.0
+
+
+def _skills(value):
+    if isinstance(value, str):
+        value = value.split(",")
+    return {_normalize_skill(str(skill)) for skill in value or []} - {""}
+
+
+def _duration_text(entry):
+    return str(entry.get("duration", "")) if isinstance(entry, dict) else str(entry)
+
+
+def _education_text(entry):
+    if isinstance(entry, dict):
+        return f"{entry.get('degree', '')} {entry.get('field', '')} {entry.get('university', '')}"
+    return str(entry)
+
+
+def _flatten(rows, text=None):
+    """Every entry of every row (as text, given `text`), with the index of the row it came from."""
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    entries = chain.from_iterable(rows)
+    return list(map(text, entries) if text else entries), np.repeat(np.arange(len(rows)), lengths)
+
+
+def _encode(texts):
+    """Distinct texts and, for each text, the index of its distinct value.
+
+    Profiles repeat the same skills, degrees and durations heavily, so
+    features are computed once per distinct text and scattered back with
+    the inverse index.
+    """
+    distinct = list(dict.fromkeys(texts))
+    codes = {text: code for code, text in enumerate(distinct)}
+    return distinct, np.fromiter(map(codes.__getitem__, texts), dtype=np.int64, count=len(texts))
+
+
+def _row_hits(row_ids, inverse, columns_per_text, row_count, column_count):
+    """Count, per row, the distinct vocabulary columns its entries match.
+
+    `columns_per_text` lists the matched columns of each distinct text; the
+    (row, column) pairs are expanded, deduplicated and counted in numpy.
+    """
+    lengths = np.fromiter(map(len, columns_per_text), dtype=np.int64, count=len(columns_per_text))
+    if not lengths.any() or not len(inverse):
+        return np.zeros(row_count)
+    offsets = np.cumsum(lengths) - lengths
+    flat = np.fromiter((column for columns in columns_per_text for column in columns), dtype=np.int64)
+    counts = lengths[inverse]
+    starts = np.repeat(offsets[inverse] - (np.cumsum(counts) - counts), counts)
+    columns = flat[starts + np.arange(counts.sum())]
+    pairs = np.unique(np.repeat(row_ids, counts) * column_count + columns)
+    return np.bincount(pairs // column_count, minlength=row_count).astype(np.float64)
+
+
+def _term_hits(profiles, field, text, vocabulary, terms):
+    """_row_hits of a list field, with `terms` turning a distinct entry into vocabulary keys."""
+    texts, row_ids = _flatten([p.get(field) or () for p in profiles], text)
+    distinct, inverse = _encode(texts)
+    columns_per_text = [
+        sorted({vocabulary[term] for term in terms(value) if term in vocabulary}) for value in distinct
+    ]
+    return _row_hits(row_ids, inverse, columns_per_text, len(profiles), len(vocabulary))
+
+
+def _experience_years(profiles):
+    texts, row_ids = _flatten([p.get("experience") or () for p in profiles], _duration_text)
+    distinct, inverse = _encode(texts)
+    years = np.fromiter(map(_duration_years, distinct), dtype=np.float64, count=len(distinct))
+    return np.bincount(row_ids, weights=years[inverse], minlength=len(profiles))
+
+
+def score_profiles(job, profiles):
+    """Score candidate profiles against a job; returns an array of 0-100 scores."""
+    required_skills = {skill: i for i, skill in enumerate(sorted(_skills(job.get("skills_required"))))}
+    qualification = {word: i for i, word in enumerate(sorted(_words(job.get("qualification") or "")))}
+    required_years = float(job.get("experience_years") or 0)
+
+    skill_hits = _term_hits(profiles, "skills", None, required_skills, lambda skill: (_normalize_skill(str(skill)),))
+    qualification_hits = _term_hits(profiles, "education", _education_text, qualification, _words)
+    years = _experience_years(profiles)
+
+    skills_score = skill_hits / len(required_skills) if required_skills else np.ones(len(profiles))
+    qualification_score = qualification_hits / len(qualification) if qualification else np.ones(len(profiles))
+    experience_score = np.minimum(years / required_years, 1.0) if required_years > 0 else np.ones(len(profiles))
+
+    scores = 100 * (
+        SKILLS_WEIGHT * skills_score
+        + EXPERIENCE_WEIGHT * experience_score
+        + QUALIFICATION_WEIGHT * qualification_score
+    )
+    return np.round(scores, 1)
+
+
+def _job_signature(job):
+    return (str(job["_id"]), job.get("skills_required"), job.get("experience_years"), job.get("qualification"))
+
+
+def _profile_version(candidate):
+    return candidate.get("updated_at") or candidate.get("created_at")
+
+
+async def score_candidates(job, candidates):
+    """Screening scores for candidate user documents, cached per profile version.
+
+    Candidates that are None (e.g. deleted accounts) score 0. Uncached
+    profiles are scored in a worker thread so the event loop keeps serving;
+    the cache itself is only touched from the loop.
+    """
+    signature = _job_signature(job)
+    scores = [0.0] * len(candidates)
+    missing = []
+    for i, candidate in enumerate(candidates):
+        if candidate is None:
+            continue
+        key = (signature, str(candidate["_id"]), _profile_version(candidate))
+        cached = _scores.get(key)
+        if cached is None:
+            missing.append((i, key))
+        else:
+            scores[i] = cached
+    if missing:
+        profiles = [candidates[i].get("profile") or {} for i, _ in missing]
+        fresh = await asyncio.to_thread(score_profiles, job, profiles)
+        for (i, key), score in zip(missing, fresh.tolist()):
+            scores[i] = score
+            _scores.set(key, score)
+    return scores
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from bson import ObjectId
+
+# The backend modules are imported top-level, as uvicorn does from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class WriteSink:
+    """Stands in for bookkeeping collections (resource_versions, platform_stats)
+    whose writes a test does not inspect."""
+
+    async def bulk_write(self, *args, **kwargs):
+        pass
+
+    async def update_one(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def candidate():
+    return {"_id": ObjectId(), "role": "candidate", "name": "Casey", "email": "casey@example.com"}
+
+
+@pytest.fixture
+def write_sink():
+    return WriteSink()
+
+
+@pytest.fixture
+def login_as():
+    """Authenticate every request of the test as the given user."""
+    def login(user):
+        async def current_user():
+            return user
+
+        main.app.dependency_overrides[main.get_current_user] = current_user
+
+    yield login
+    main.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def api():
+    """Return a factory of clients talking to the app in-process."""
+    def client():
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+    return client
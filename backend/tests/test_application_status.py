@@ -0,0 +1,55 @@
+"""Setting an application to its current status writes nothing."""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+import main
+
+RECRUITER = {"_id": ObjectId(), "role": "recruiter", "name": "Riley", "email": "riley@example.com"}
+
+
+class FakeApplications:
+    def __init__(self, document):
+        self.document = document
+
+    def _matches(self, query):
+        return all(
+            self.document.get(key) != value["$ne"] if isinstance(value, dict) else self.document.get(key) == value
+            for key, value in query.items()
+        )
+
+    async def find_one_and_update(self, query, update):
+        if not self._matches(query):
+            return None
+        previous = dict(self.document)
+        self.document.update(update["$set"])
+        return previous
+
+    async def find_one(self, query, projection=None):
+        return self.document if self._matches(query) else None
+
+
+def test_unchanged_status_keeps_the_timestamp(monkeypatch, login_as, api):
+    changed_at = datetime(2024, 1, 1)
+    application = {
+        "_id": ObjectId(), "recruiter_id": str(RECRUITER["_id"]), "job_id": str(ObjectId()),
+        "status": "hired", "updated_at": changed_at,
+    }
+    monkeypatch.setattr(main, "db", SimpleNamespace(applications=FakeApplications(application)))
+
+    login_as(RECRUITER)
+
+    async def put(status):
+        async with api() as client:
+            return await client.put(f"/api/recruiter/applications/{application['_id']}", json={"status": status})
+
+    response = asyncio.run(put("hired"))
+
+    assert response.status_code == 200
+    assert application["updated_at"] == changed_at
+
+    # Another recruiter's application is still not found
+    application["recruiter_id"] = "someone-else"
+    assert asyncio.run(put("hired")).status_code == 404
@@ -0,0 +1,120 @@
+"""Applying twice for the same job is rejected by the unique index."""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+import indexes
+import job_cache
+import job_counters
+import main
+import platform_stats
+import resource_versions
+
+
+class FakeJobs:
+    async def find_one(self, query, projection=None):
+        return {"_id": query["_id"], "title": "Backend Developer", "company_id": "recruiter-1"}
+
+    async def update_one(self, *args, **kwargs):
+        pass
+
+
+class FakeApplications:
+    """Behaves like a collection with the unique (job_id, candidate_id) index."""
+
+    def __init__(self):
+        self.keys = set()
+
+    async def insert_one(self, document):
+        key = (document["job_id"], document["candidate_id"])
+        if key in self.keys:
+            raise DuplicateKeyError("E11000 duplicate key error", code=11000)
+        self.keys.add(key)
+        return SimpleNamespace(inserted_id=ObjectId())
+
+
+def test_duplicate_application_is_rejected(monkeypatch, candidate, write_sink, login_as, api):
+    monkeypatch.setattr(main, "db", SimpleNamespace(
+        jobs=FakeJobs(), applications=FakeApplications(), resource_versions=write_sink, platform_stats=write_sink,
+    ))
+    job_cache.invalidate()
+    login_as(candidate)
+    job_id = str(ObjectId())
+
+    async def apply_concurrently(times):
+        async with api() as client:
+            return await asyncio.gather(*(client.post(f"/api/candidate/apply/{job_id}") for _ in range(times)))
+
+    responses = asyncio.run(apply_concurrently(5))
+
+    assert sorted(response.status_code for response in responses) == [200, 400, 400, 400, 400]
+    rejected = [response.json() for response in responses if response.status_code == 400]
+    assert all(body == {"detail": "Already applied for this job"} for body in rejected)
+
+
+class FakeIndexedCollection:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    async def index_information(self):
+        return {}
+
+    async def create_indexes(self, models):
+        if models[0].document["name"] in self.failing:
+            raise OperationFailure("E11000 duplicate key error")
+
+
+class FakeDatabase(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_startup_fails_without_the_unique_index():
+    # The fakes cannot delete, so this also checks startup leaves data alone
+    db = FakeDatabase({name: FakeIndexedCollection() for name in indexes.INDEXES})
+    db["applications"] = FakeIndexedCollection(failing={indexes.UNIQUE_APPLICATION_INDEX})
+
+    with pytest.raises(RuntimeError, match=indexes.UNIQUE_APPLICATION_INDEX):
+        asyncio.run(indexes.ensure_indexes(db))
+
+
+class FakeDuplicateApplications:
+    def __init__(self, groups):
+        self.groups = groups
+        self.deleted = []
+
+    async def aggregate(self, pipeline, **kwargs):
+        for group in self.groups:
+            yield group
+
+    async def delete_many(self, query):
+        self.deleted.extend(query["_id"]["$in"])
+
+
+def test_dedupe_keeps_the_most_advanced_application(monkeypatch):
+    async def noop(*args, **kwargs):
+        pass
+
+    for module, name in ((job_counters, "release_applications"), (platform_stats, "bump"), (resource_versions, "bump")):
+        monkeypatch.setattr(module, name, noop)
+    hired, older, newer = ObjectId(), ObjectId(), ObjectId()
+    applications = FakeDuplicateApplications([{
+        "_id": {"job_id": "job-1", "candidate_id": "candidate-1"},
+        "recruiter_id": "recruiter-1",
+        "applications": [
+            {"_id": older, "status": "pending", "applied_at": datetime(2024, 1, 1)},
+            {"_id": hired, "status": "hired", "applied_at": datetime(2024, 1, 2)},
+            {"_id": newer, "status": "pending", "applied_at": datetime(2024, 1, 3)},
+        ],
+    }])
+
+    removed = asyncio.run(indexes.remove_duplicate_applications(SimpleNamespace(applications=applications)))
+
+    assert sorted(applications.deleted) == sorted([older, newer])
+    assert {(entry["application_id"], entry["status"], entry["kept"]) for entry in removed} == {
+        (older, "pending", hired), (newer, "pending", hired),
+    }
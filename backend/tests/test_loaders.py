@@ -0,0 +1,27 @@
+"""DataLoader batches the keys requested in one tick."""
+import asyncio
+import gc
+
+from loaders import DataLoader
+
+
+def test_keys_requested_together_are_loaded_in_one_batch():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(keys)
+        # Give the garbage collector a chance at an unreferenced dispatch task
+        gc.collect()
+        await asyncio.sleep(0)
+        return {key: key.upper() for key in keys}
+
+    async def run():
+        loader = DataLoader(batch_fn)
+        values = await asyncio.gather(loader.load_many(["a", "b"]), loader.load("a"))
+        return values, loader
+
+    (values, loader) = asyncio.run(run())
+
+    assert values == [["A", "B"], "A"]
+    assert batches == [["a", "b"]]
+    assert not loader._dispatches
@@ -0,0 +1,18 @@
+"""The slow request log keeps query shapes, not command documents."""
+from types import SimpleNamespace
+
+import metrics
+
+
+def test_insert_documents_are_not_kept():
+    stats = metrics.RequestStats()
+    token = metrics._current.set(stats)
+    try:
+        documents = [{"email": f"user{i}@example.com"} for i in range(1000)]
+        for _ in range(3):
+            command = {"insert": "users", "ordered": False, "documents": documents, "$db": "jobs"}
+            metrics.CommandListener().started(SimpleNamespace(command_name="insert", command=command))
+    finally:
+        metrics._current.reset(token)
+
+    assert stats.shapes == {"insert users {'ordered': '?', 'documents': '?'}": 3}
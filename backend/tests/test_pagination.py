@@ -0,0 +1,22 @@
+"""List endpoints are paginated unless legacy responses are opted into."""
+import pagination
+from pagination import MAX_PAGE_SIZE, PageParams
+
+
+def test_requests_without_page_params_get_a_bounded_page():
+    page = PageParams()
+
+    assert page.paginated
+    assert page.limit == pagination.DEFAULT_PAGE_SIZE
+    assert page.response([]) == {"items": [], "next_cursor": None}
+
+
+def test_limit_is_clamped_to_the_maximum():
+    assert PageParams(limit=MAX_PAGE_SIZE * 10).limit == MAX_PAGE_SIZE
+
+
+def test_legacy_list_responses_are_opt_in(monkeypatch):
+    monkeypatch.setattr(pagination, "LEGACY_LIST_RESPONSES", True)
+
+    assert PageParams().response([1, 2]) == [1, 2]
+    assert PageParams(limit=5).paginated
@@ -0,0 +1,59 @@
+"""Report job counts leave out soft-deleted candidates, like the rows do."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import reports
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs=(), aggregated=()):
+        self.docs = list(docs)
+        self.aggregated = list(aggregated)
+        self.pipelines = []
+
+    def find(self, query, projection=None):
+        return FakeCursor(self.docs)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.aggregated)
+
+
+def test_job_counts_exclude_hidden_candidates():
+    job_row = {
+        "job_id": "job-1", "title": "Backend Developer",
+        "total_applications": 3, "status_counts": {"pending": 2, "hired": 1},
+        "application": {"candidate_name": "Casey", "status": "pending"}, "candidate": None,
+    }
+    db = SimpleNamespace(
+        users=FakeCollection(docs=[{"_id": "gone"}]),
+        applications=FakeCollection(aggregated=[{"_id": {"job_id": "job-1", "status": "hired"}, "count": 1}]),
+        jobs=FakeCollection(aggregated=[job_row]),
+    )
+
+    async def lines():
+        return [json.loads(line) async for line in reports.ndjson_report(reports.report_rows(db, "recruiter-1"))]
+
+    job, application = asyncio.run(lines())
+
+    assert (job["total_applications"], job["pending_applications"], job["hired_applications"]) == (2, 2, 0)
+    assert application["name"] == "Casey"
+    # The rows are filtered on the same ids
+    lookup = db.jobs.pipelines[0][3]["$lookup"]
+    assert lookup["pipeline"] == [{"$match": {"candidate_id": {"$nin": ["gone"]}}}]
@@ -0,0 +1,57 @@
+"""A restore makes every conditional-GET tag stale."""
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+import resource_versions
+
+
+class FakeVersions:
+    def __init__(self):
+        self.versions = {}
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            scope = request._filter["_id"]
+            self.versions[scope] = self.versions.get(scope, 0) + 1
+
+    def find(self, query):
+        docs = [{"_id": scope, "v": self.versions[scope]} for scope in query["_id"]["$in"] if scope in self.versions]
+
+        class Cursor:
+            async def to_list(self, length=None):
+                return docs
+
+        return Cursor()
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/api/recruiter/jobs", "query_string": b"", "headers": headers})
+
+
+async def _tag(db, if_none_match=None):
+    response = Response()
+    await resource_versions.check(db, _request(if_none_match), response, ["recruiter:r1"], "r1")
+    return response.headers["ETag"]
+
+
+def test_invalidate_all_changes_tags_of_untouched_scopes():
+    db = SimpleNamespace(resource_versions=FakeVersions())
+
+    async def scenario():
+        tag = await _tag(db)
+        try:
+            await _tag(db, tag)
+        except HTTPException as exc:
+            assert exc.status_code == 304
+        else:
+            raise AssertionError("expected 304 for a current tag")
+        await resource_versions.invalidate_all(db)
+        return tag, await _tag(db, tag)
+
+    before, after = asyncio.run(scenario())
+
+    assert before != after
@@ -0,0 +1,37 @@
+"""Screening scores from the vectorized feature extraction."""
+from bson import ObjectId
+
+import screening
+
+JOB = {
+    "_id": ObjectId(),
+    "skills_required": "Python, MongoDB",
+    "experience_years": 4,
+    "qualification": "Bachelor's in Computer Science",
+}
+
+
+def test_scores_count_each_matching_term_once():
+    profiles = [
+        {
+            # Repeated and differently written skills match once
+            "skills": ["Python", " python ", "Go"],
+            "education": [{"degree": "Bachelor's", "field": "Computer Science"}, "Bachelor's in Arts"],
+            "experience": [{"duration": "2 years"}, "1 year"],
+        },
+        {"skills": ["MongoDB", "Python"], "education": ["BSc Computer Science"], "experience": [{"duration": "6 yrs"}]},
+        {},
+    ]
+
+    scores = screening.score_profiles(JOB, profiles)
+
+    # qualification words: bachelor's, computer, science
+    assert scores.tolist() == [
+        round(100 * (0.6 * 1 / 2 + 0.25 * 3 / 4 + 0.15 * 3 / 3), 1),
+        round(100 * (0.6 * 2 / 2 + 0.25 * 1 + 0.15 * 2 / 3), 1),
+        0.0,
+    ]
+
+
+def test_no_profiles():
+    assert screening.score_profiles(JOB, []).tolist() == []
@@ -0,0 +1,32 @@
+"""Job search rejects cursors that do not match its sort mode."""
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import main
+from pagination import encode_cursor
+
+
+@pytest.mark.parametrize("params", [
+    # Cursor of the newest-first listing reused for a text search, and vice versa
+    {"q": "python", "cursor": encode_cursor({"created_at": datetime.utcnow(), "_id": ObjectId()})},
+    {"cursor": encode_cursor({"score": 1.5, "_id": ObjectId()})},
+    {"q": "python", "cursor": encode_cursor({"score": "high", "_id": ObjectId()})},
+    {"cursor": encode_cursor({"created_at": datetime.utcnow(), "_id": "not-an-id"})},
+    {"cursor": encode_cursor({"_id": ObjectId()})},
+])
+def test_mismatched_cursor_is_rejected(monkeypatch, candidate, login_as, api, params):
+    # Any query reaching the database would fail the test
+    monkeypatch.setattr(main, "db", None)
+    login_as(candidate)
+
+    async def search():
+        async with api() as client:
+            return await client.get("/api/candidate/jobs/search", params=params)
+
+    response = asyncio.run(search())
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
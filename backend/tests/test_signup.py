@@ -0,0 +1,139 @@
+"""Signup with an email that is taken: imported candidates and concurrent signups."""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+import main
+
+EMAIL = "sam@example.com"
+
+
+def imported(token=None, expires_at=None):
+    document = {"_id": ObjectId(), "role": "candidate", "name": "Imported", "email": EMAIL, "password": None}
+    if token:
+        document["claim_token"] = {
+            "hash": main._claim_token_hash(token),
+            "expires_at": expires_at or datetime.utcnow() + timedelta(hours=1),
+        }
+    return document
+
+
+class FakeUsers:
+    def __init__(self, *documents):
+        self.documents = {document["email"]: dict(document) for document in documents}
+
+    async def find_one(self, query, projection=None):
+        return self.documents.get(query["email"])
+
+    async def update_one(self, query, update):
+        for document in self.documents.values():
+            token = document.get("claim_token") or {}
+            if (
+                document["_id"] == query["_id"] and document.get("password") is None
+                and token.get("hash") == query["claim_token.hash"]
+                and token.get("expires_at") > query["claim_token.expires_at"]["$gt"]
+            ):
+                document.update(update["$set"])
+                for field in update["$unset"]:
+                    document.pop(field)
+                return SimpleNamespace(modified_count=1)
+        return SimpleNamespace(modified_count=0)
+
+
+@pytest.fixture
+def use_users(monkeypatch, write_sink):
+    def use(document):
+        users = FakeUsers(document)
+        monkeypatch.setattr(main, "db", SimpleNamespace(users=users, resource_versions=write_sink))
+        return users.documents[EMAIL]
+
+    return use
+
+
+@pytest.fixture
+def signup(api):
+    """Post the payloads concurrently and return the responses in order."""
+    async def post(payloads):
+        async with api() as client:
+            return await asyncio.gather(*(client.post("/api/auth/signup", json=payload) for payload in payloads))
+
+    def run(*payloads):
+        return asyncio.run(post(payloads))
+
+    return run
+
+
+def _payload(**fields):
+    return {"name": "Sam", "email": EMAIL, "password": "s3cret-pass", **fields}
+
+
+def test_signup_without_a_claim_token_is_rejected(use_users, signup):
+    stored = use_users(imported(token="invite"))
+
+    (response,) = signup(_payload())
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Email already registered"}
+    assert stored["password"] is None
+
+
+def test_claim_token_works_once(use_users, signup):
+    stored = use_users(imported(token="invite"))
+
+    first, second = signup(_payload(claim_token="invite"), _payload(claim_token="invite"))
+
+    assert sorted([first.status_code, second.status_code]) == [200, 400]
+    assert stored["password"] is not None
+    assert stored["name"] == "Sam"
+    assert "claim_token" not in stored
+
+
+def test_wrong_or_expired_claim_token_is_rejected(use_users, signup):
+    stored = use_users(imported(token="invite", expires_at=datetime.utcnow() - timedelta(minutes=1)))
+
+    responses = signup(_payload(claim_token="guess"), _payload(claim_token="invite"))
+
+    assert [response.status_code for response in responses] == [400, 400]
+    assert stored["password"] is None
+
+
+def test_claim_token_cannot_create_a_recruiter(use_users, signup):
+    stored = use_users(imported(token="invite"))
+
+    (response,) = signup(_payload(claim_token="invite", role="recruiter"))
+
+    assert response.status_code == 400
+    assert stored["password"] is None
+
+
+class RacingUsers:
+    """Both signups pass the existence check; the unique index rejects the second insert."""
+
+    def __init__(self):
+        self.emails = set()
+
+    async def find_one(self, query, projection=None):
+        return None
+
+    async def insert_one(self, document):
+        if document["email"] in self.emails:
+            raise DuplicateKeyError("E11000 duplicate key error", code=11000)
+        self.emails.add(document["email"])
+        return SimpleNamespace(inserted_id=ObjectId())
+
+
+def test_concurrent_signups_with_one_email_get_a_400(monkeypatch, write_sink, signup):
+    monkeypatch.setattr(main, "db", SimpleNamespace(
+        users=RacingUsers(), resource_versions=write_sink, platform_stats=write_sink,
+    ))
+
+    responses = signup(_payload(), _payload())
+
+    assert sorted(response.status_code for response in responses) == [200, 400]
+    assert [response.json() for response in responses if response.status_code == 400] == [
+        {"detail": "Email already registered"}
+    ]
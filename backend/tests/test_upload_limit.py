@@ -0,0 +1,45 @@
+"""Oversized profile pictures are refused on their Content-Length."""
+import asyncio
+
+import blob_store
+
+
+def test_oversized_upload_is_refused_before_the_body_is_read():
+    received = []
+
+    async def receive():
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    length = blob_store.MAX_UPLOAD_BYTES + blob_store.MULTIPART_OVERHEAD_BYTES + 1
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/candidate/upload-profile-picture",
+        "headers": [(b"content-length", str(length).encode())],
+    }
+
+    async def app(scope, receive, send):
+        raise AssertionError("the route must not run")
+
+    asyncio.run(blob_store.UploadSizeLimit(app, [scope["path"]])(scope, receive, send))
+
+    assert received == []
+    assert sent[0]["status"] == 413
+    assert b"File too large" in sent[1]["body"]
+
+
+def test_upload_within_the_limit_reaches_the_route(candidate, login_as, api):
+    login_as({**candidate, "role": "recruiter"})
+
+    async def upload():
+        async with api() as client:
+            return await client.post("/api/candidate/upload-profile-picture", files={"file": ("a.png", b"x" * 1024)})
+
+    response = asyncio.run(upload())
+
+    # Past the size check, the role check of the handler answers
+    assert response.status_code == 403
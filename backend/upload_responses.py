@@ -0,0 +1,94 @@
+"""HTTP responses for files in the blob store.
+
+Content-addressed keys are served as immutable (a new picture gets a new
+URL), so browsers and proxies can cache them for a year without
+revalidating. Every response carries a strong ETag and honours
+If-None-Match, Range and If-Range; SVGs are sent precompressed when the
+client accepts gzip.
+"""
+import re
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+import blob_store
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Files stored under older, mutable names must be revalidated
+MUTABLE_CACHE_CONTROL = "public, no-cache"
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """(start, end) for a single byte range, None to send the whole file.
+
+    Multiple ranges are answered with the full body, which RFC 9110 allows.
+    Raises 416 when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def _accepts_gzip(request: Request):
+    accept = request.headers.get("accept-encoding", "")
+    return any(
+        part.split(";")[0].strip() == "gzip" and not part.replace(" ", "").endswith("q=0")
+        for part in accept.split(",")
+    )
+
+
+async def blob_response(store, key, request: Request):
+    blob = await store.open(key) if blob_store.KEY_PATTERN.match(key) else None
+    if blob is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if blob_store.is_immutable(key) else MUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+        # Uploaded SVGs must not run scripts when opened directly
+        "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+    }
+    media_type = blob_store.content_type(key)
+    range_header = request.headers.get("range")
+
+    # Byte ranges always refer to the identity encoding
+    if key.rsplit(".", 1)[-1] in blob_store.PRECOMPRESSED_EXTENSIONS:
+        headers["Vary"] = "Accept-Encoding"
+        if not range_header and _accepts_gzip(request):
+            compressed = await store.open(blob_store.gzip_key(key))
+            if compressed is not None:
+                blob = compressed
+                headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = blob.etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or blob.etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if range_header and request.headers.get("if-range", blob.etag) == blob.etag:
+        byte_range = parse_range(range_header, blob.size)
+    if byte_range is None:
+        headers["Content-Length"] = str(blob.size)
+        return StreamingResponse(blob.chunks(), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start)
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{blob.size}"
+    return StreamingResponse(blob.chunks(start, end), status_code=206, media_type=media_type, headers=headers)
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { api } from '../../services/api';
+import { api, getAll } from '../../services/api';
 import { Users, Building, Eye, Trash2, X, Briefcase, UserCheck, Calendar } from 'lucide-react';
 import Sidebar from '../Layout/Sidebar';
 import './AdminCustomers.css';
@@ -36,8 +36,8 @@ const AdminCustomers = () => {
     try {
       setLoading(true);
       const [companiesResponse, candidatesResponse] = await Promise.all([
-        api.get('/admin/customers'),
-        api.get('/admin/candidates')
+        getAll('/admin/customers'),
+        getAll('/admin/candidates')
       ]);
       
       setCompanies(companiesResponse.data);
@@ -88,7 +88,7 @@ const AdminCustomers = () => {
       // Fetch company's jobs and applications
       const [jobsResponse, applicationsResponse] = await Promise.all([
         api.get(`/admin/company/${company._id}/jobs`),
-        api.get(`/admin/company/${company._id}/applications`)
+        getAll(`/admin/company/${company._id}/applications`)
       ]);
       
       setCompanyJobs(jobsResponse.data || []);
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { api } from '../../services/api';
+import { api, getAll } from '../../services/api';
 import { Settings, User, Bell, Lock, Download, Shield, Database, Trash2, Eye, EyeOff, FileText, BarChart3, Users } from 'lucide-react';
 import Sidebar from '../Layout/Sidebar';
 import './AdminSettings.css';
@@ -196,8 +196,8 @@ const AdminSettings = () => {
       setLoading(true);
       
       const [companiesResponse, candidatesResponse] = await Promise.all([
-        api.get('/admin/customers'),
-        api.get('/admin/candidates')
+        getAll('/admin/customers'),
+        getAll('/admin/candidates')
       ]);
 
       const companies = companiesResponse.data;
@@ -209,7 +209,7 @@ const AdminSettings = () => {
           try {
             const [jobsResponse, applicationsResponse] = await Promise.all([
               api.get(`/admin/company/${company._id}/jobs`),
-              api.get(`/admin/company/${company._id}/applications`)
+              getAll(`/admin/company/${company._id}/applications`)
             ]);
             
             return {
@@ -355,8 +355,8 @@ const AdminSettings = () => {
       setLoading(true);
       
       const [companiesResponse, candidatesResponse] = await Promise.all([
-        api.get('/admin/customers'),
-        api.get('/admin/candidates')
+        getAll('/admin/customers'),
+        getAll('/admin/candidates')
       ]);
 
       let csvContent = "User Type,Name,Email,Company,Registration Date,Status,Profile Completion,Total Applications\n";
@@ -392,8 +392,8 @@ const AdminSettings = () => {
   const performSystemBackup = async () => {
     try {
       setLoading(true);
-      await api.post('/admin/system-backup');
-      showMessage('success', 'System backup completed successfully!');
+      const response = await api.post('/admin/system-backup');
+      showMessage('success', `System backup started (${response.data.backup_id})`);
     } catch (error) {
       showMessage('error', 'Failed to perform system backup: ' + (error.response?.data?.detail || error.message));
     } finally {
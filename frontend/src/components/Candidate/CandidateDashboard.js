@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { api } from '../../services/api';
+import { api, getAll } from '../../services/api';
 import Sidebar from '../Layout/Sidebar';
 import './CandidateDashboard.css';
 
@@ -27,11 +27,11 @@ const CandidateDashboard = () => {
         setLoading(true);
         
         // Fetch applied jobs
-        const applicationsResponse = await api.get('/candidate/applications');
+        const applicationsResponse = await getAll('/candidate/applications');
         setAppliedJobs(applicationsResponse.data);
 
         // Fetch available jobs for recommendations (limit to 6)
-        const jobsResponse = await api.get('/candidate/jobs');
+        const jobsResponse = await getAll('/candidate/jobs');
         const availableJobs = jobsResponse.data.filter(job => !job.has_applied).slice(0, 6);
         setRecommendedJobs(availableJobs);
 
@@ -72,7 +72,7 @@ const CandidateDashboard = () => {
       setRecommendedJobs(recommendedJobs.filter(job => job._id !== jobId));
       
       // Refresh applied jobs
-      const applicationsResponse = await api.get('/candidate/applications');
+      const applicationsResponse = await getAll('/candidate/applications');
       setAppliedJobs(applicationsResponse.data);
       
       alert('Application submitted successfully!');
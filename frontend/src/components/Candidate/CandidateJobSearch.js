@@ -10,8 +10,10 @@ const CandidateJobSearch = () => {
   const navigate = useNavigate();
 
   const [jobs, setJobs] = useState([]);
-  const [filteredJobs, setFilteredJobs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [knownLocations, setKnownLocations] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [locationFilter, setLocationFilter] = useState('all');
@@ -25,13 +27,35 @@ const CandidateJobSearch = () => {
     { name: 'Settings', path: '/candidate/settings' }
   ];
 
+  const buildSearchParams = (cursor) => {
+    const params = {};
+    if (searchTerm.trim()) params.q = searchTerm.trim();
+    if (locationFilter !== 'all') params.location = locationFilter;
+    if (experienceFilter !== 'all') params.max_experience = parseInt(experienceFilter);
+    if (cursor) params.cursor = cursor;
+    return params;
+  };
+
+  const rememberLocations = (pageJobs) => {
+    setKnownLocations(prev => {
+      const locations = [...prev];
+      pageJobs.forEach(job => {
+        if (job.location && job.location.trim() && !locations.includes(job.location)) {
+          locations.push(job.location);
+        }
+      });
+      return locations;
+    });
+  };
+
+  // Search runs on the server; re-query (debounced) whenever the filters change
   useEffect(() => {
     const fetchJobs = async () => {
       try {
-        setLoading(true);
-        const response = await api.get('/candidate/jobs');
-        setJobs(response.data);
-        setFilteredJobs(response.data);
+        const response = await api.get('/candidate/jobs/search', { params: buildSearchParams() });
+        setJobs(response.data.items);
+        setNextCursor(response.data.next_cursor);
+        rememberLocations(response.data.items);
         setError('');
       } catch (err) {
         setError('Failed to load jobs');
@@ -41,37 +65,25 @@ const CandidateJobSearch = () => {
       }
     };
 
-    fetchJobs();
-  }, []);
+    const timer = setTimeout(fetchJobs, 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm, locationFilter, experienceFilter]);
 
-  useEffect(() => {
-    let filtered = jobs;
-
-    // Search filter
-    if (searchTerm) {
-      filtered = filtered.filter(job =>
-        job.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        job.skills_required.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        job.company_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        job.description.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    // Location filter
-    if (locationFilter !== 'all') {
-      filtered = filtered.filter(job =>
-        job.location && job.location.toLowerCase().includes(locationFilter.toLowerCase())
-      );
-    }
-
-    // Experience filter
-    if (experienceFilter !== 'all') {
-      const expYears = parseInt(experienceFilter);
-      filtered = filtered.filter(job => job.experience_years <= expYears);
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const response = await api.get('/candidate/jobs/search', { params: buildSearchParams(nextCursor) });
+      setJobs(prev => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+      rememberLocations(response.data.items);
+    } catch (err) {
+      console.error('Error fetching more jobs:', err);
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredJobs(filtered);
-  }, [jobs, searchTerm, locationFilter, experienceFilter]);
+  };
 
   const handleApply = async (jobId) => {
     try {
@@ -94,14 +106,6 @@ const CandidateJobSearch = () => {
     return new Date(dateString).toLocaleDateString();
   };
 
-  const getUniqueLocations = () => {
-    const locations = jobs
-      .map(job => job.location)
-      .filter(location => location && location.trim())
-      .filter((location, index, arr) => arr.indexOf(location) === index);
-    return locations;
-  };
-
   const openJobModal = (job) => {
     setSelectedJob(job);
   };
@@ -162,7 +166,7 @@ const CandidateJobSearch = () => {
       <div className="main-content">
         <div className="search-header">
           <h1>Find Your Next Opportunity</h1>
-          <p>Discover {jobs.length} available positions</p>
+          <p>Discover available positions</p>
         </div>
 
         {/* Search and Filter Section */}
@@ -186,7 +190,7 @@ const CandidateJobSearch = () => {
                 className="filter-select"
               >
                 <option value="all">All Locations</option>
-                {getUniqueLocations().map((location, index) => (
+                {knownLocations.map((location, index) => (
                   <option key={index} value={location}>{location}</option>
                 ))}
               </select>
@@ -211,19 +215,19 @@ const CandidateJobSearch = () => {
 
         {/* Results Summary */}
         <div className="results-summary">
-          <p>Showing {filteredJobs.length} of {jobs.length} jobs</p>
+          <p>Showing {jobs.length} {nextCursor ? 'most relevant ' : ''}jobs</p>
         </div>
 
         {/* Job Listings */}
         <div className="jobs-section">
-          {filteredJobs.length === 0 ? (
+          {jobs.length === 0 ? (
             <div className="no-jobs">
               <h3>No jobs found</h3>
               <p>Try adjusting your search criteria or check back later for new opportunities.</p>
             </div>
           ) : (
             <div className="jobs-grid">
-              {filteredJobs.map((job) => (
+              {jobs.map((job) => (
                 <div key={job._id} className="job-card">
                   <div className="job-header">
                     <h3>{job.title}</h3>
@@ -283,6 +287,13 @@ const CandidateJobSearch = () => {
               ))}
             </div>
           )}
+          {nextCursor && (
+            <div className="load-more">
+              <button className="view-details-btn" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more jobs'}
+              </button>
+            </div>
+          )}
         </div>
 
         {/* Job Detail Modal */}
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { api } from '../../services/api';
+import { api, getAll } from '../../services/api';
 import { Users, UserCheck, Clock, TrendingUp, Briefcase, Download, Eye, Trash2 } from 'lucide-react';
 import Sidebar from '../Layout/Sidebar';
 import './RecruiterDashboard.css';
@@ -42,7 +42,7 @@ const RecruiterDashboard = () => {
         // Fetch stats and jobs
         const [statsResponse, jobsResponse] = await Promise.all([
           api.get('/recruiter/stats'),
-          api.get('/recruiter/jobs')
+          getAll('/recruiter/jobs')
         ]);
         
         setStats(statsResponse.data);
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { api } from '../../services/api';
+import { api, getAll } from '../../services/api';
 import { TrendingUp, Users, Clock, Eye, UserCheck, UserX, Calendar, Briefcase } from 'lucide-react';
 import Sidebar from '../Layout/Sidebar';
 import './RecruiterProgress.css';
@@ -36,7 +36,7 @@ const RecruiterProgress = () => {
         
         // Fetch jobs and stats
         const [jobsResponse, statsResponse] = await Promise.all([
-          api.get('/recruiter/jobs'),
+          getAll('/recruiter/jobs'),
           api.get('/recruiter/stats')
         ]);
         
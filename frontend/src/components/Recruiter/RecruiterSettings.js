@@ -171,35 +171,74 @@ const RecruiterSettings = () => {
     }
   };
 
+  const saveFile = (data, type, filename) => {
+    const blob = data instanceof Blob ? data : new Blob([data], { type });
+    const url = URL.createObjectURL(blob);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = filename;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    URL.revokeObjectURL(url);
+  };
+
+  const getMostPopularSkills = (jobs) => {
+    const counts = {};
+    jobs.forEach(job => {
+      (job.skills_required || '').split(',').map(skill => skill.trim()).filter(Boolean).forEach(skill => {
+        counts[skill] = (counts[skill] || 0) + 1;
+      });
+    });
+    return Object.entries(counts)
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, 10)
+      .map(([skill, count]) => ({ skill, job_count: count }));
+  };
+
+  const getApplicationTrends = (jobs) => {
+    const byMonth = {};
+    jobs.forEach(job => {
+      job.candidates_details.forEach(app => {
+        const month = (app.application_date || '').slice(0, 7);
+        if (month) byMonth[month] = (byMonth[month] || 0) + 1;
+      });
+    });
+    return Object.keys(byMonth).sort().map(month => ({ month, applications: byMonth[month] }));
+  };
+
   const downloadComprehensiveReport = async () => {
     try {
       setLoading(true);
-      const [jobsResponse, statsResponse] = await Promise.all([
-        api.get('/recruiter/jobs'),
+      // The backend builds the job/candidate breakdown in one streamed NDJSON response
+      const [reportResponse, statsResponse] = await Promise.all([
+        api.get('/recruiter/report', { params: { format: 'ndjson' }, responseType: 'text' }),
         api.get('/recruiter/stats')
       ]);
 
-      const jobs = jobsResponse.data;
       const stats = statsResponse.data;
+      const jobs = [];
+      reportResponse.data.split('\n').filter(Boolean).forEach(line => {
+        const record = JSON.parse(line);
+        if (record.type === 'job') {
+          const { type, job_id, experience_years, ...job } = record;
+          jobs.push({
+            ...job,
+            experience_required: experience_years + ' years',
+            location: job.location || 'Not specified',
+            salary_range: job.salary_range || 'Not specified',
+            candidates_details: []
+          });
+        } else if (record.type === 'application' && jobs.length > 0) {
+          const { type, job_id, profile_summary, ...app } = record;
+          jobs[jobs.length - 1].candidates_details.push({
+            ...app,
+            profile_summary: profile_summary || 'Profile not available'
+          });
+        }
+      });
 
-      // Get detailed applications for each job
-      const jobsWithApplications = await Promise.all(
-        jobs.map(async (job) => {
-          try {
-            const applicationsResponse = await api.get(`/recruiter/applications/${job._id}`);
-            return {
-              ...job,
-              applications: applicationsResponse.data || []
-            };
-          } catch (error) {
-            return {
-              ...job,
-              applications: []
-            };
-          }
-        })
-      );
-
+      const pendingApplications = jobs.reduce((acc, job) => acc + job.pending_applications, 0);
       const report = {
         company_info: {
           company_name: user.company || 'N/A',
@@ -217,56 +256,24 @@ const RecruiterSettings = () => {
           average_time_to_hire: stats.time_to_hire + ' days',
           cost_per_hire: '$' + stats.cost_per_hire.toLocaleString()
         },
-        detailed_job_breakdown: jobsWithApplications.map(job => ({
-          job_title: job.title,
-          skills_required: job.skills_required,
-          experience_required: job.experience_years + ' years',
-          qualification: job.qualification,
-          location: job.location || 'Not specified',
-          salary_range: job.salary_range || 'Not specified',
-          posted_date: job.created_at,
-          status: job.status,
-          total_applications: job.applications.length,
-          pending_applications: job.applications.filter(app => app.status === 'pending').length,
-          approved_applications: job.applications.filter(app => app.status === 'approved').length,
-          rejected_applications: job.applications.filter(app => app.status === 'rejected').length,
-          hired_applications: job.applications.filter(app => app.status === 'hired').length,
-          candidates_details: job.applications.map(app => ({
-            name: app.candidate_name,
-            email: app.candidate_email,
-            application_date: app.applied_at,
-            current_status: app.status,
-            profile_summary: app.candidate_details?.profile ? {
-              skills: app.candidate_details.profile.skills || [],
-              experience: app.candidate_details.profile.experience || [],
-              education: app.candidate_details.profile.education || [],
-              bio: app.candidate_details.profile.bio || 'Not provided'
-            } : 'Profile not available'
-          }))
-        })),
+        detailed_job_breakdown: jobs,
         recruitment_analytics: {
-          most_popular_skills: this.getMostPopularSkills(jobsWithApplications),
-          application_trends: this.getApplicationTrends(jobsWithApplications),
+          most_popular_skills: getMostPopularSkills(jobs),
+          application_trends: getApplicationTrends(jobs),
           hiring_funnel: {
             applications_received: stats.total_applicants,
-            applications_reviewed: stats.total_applicants - jobsWithApplications.reduce((acc, job) => acc + job.applications.filter(app => app.status === 'pending').length, 0),
+            applications_reviewed: stats.total_applicants - pendingApplications,
             candidates_shortlisted: stats.shortlisted_candidates,
             candidates_hired: stats.hired_candidates
           }
         }
       };
 
-      // Create and download the comprehensive report
-      const dataStr = JSON.stringify(report, null, 2);
-      const dataBlob = new Blob([dataStr], { type: 'application/json' });
-      const url = URL.createObjectURL(dataBlob);
-      const link = document.createElement('a');
-      link.href = url;
-      link.download = `comprehensive-recruitment-report-${user.company?.replace(/\s+/g, '-') || 'company'}-${new Date().toISOString().split('T')[0]}.json`;
-      document.body.appendChild(link);
-      link.click();
-      document.body.removeChild(link);
-      URL.revokeObjectURL(url);
+      saveFile(
+        JSON.stringify(report, null, 2),
+        'application/json',
+        `comprehensive-recruitment-report-${user.company?.replace(/\s+/g, '-') || 'company'}-${new Date().toISOString().split('T')[0]}.json`
+      );
 
       showMessage('success', 'Comprehensive recruitment report downloaded successfully!');
     } catch (error) {
@@ -279,49 +286,13 @@ const RecruiterSettings = () => {
   const downloadCSVReport = async () => {
     try {
       setLoading(true);
-      const jobsResponse = await api.get('/recruiter/jobs');
-      const jobs = jobsResponse.data;
-
-      const jobsWithApplications = await Promise.all(
-        jobs.map(async (job) => {
-          try {
-            const applicationsResponse = await api.get(`/recruiter/applications/${job._id}`);
-            return {
-              ...job,
-              applications: applicationsResponse.data || []
-            };
-          } catch (error) {
-            return {
-              ...job,
-              applications: []
-            };
-          }
-        })
-      );
+      const response = await api.get('/recruiter/report', { params: { format: 'csv' }, responseType: 'blob' });
 
-      // Create CSV data
-      let csvContent = "Job Title,Skills Required,Experience,Location,Salary,Posted Date,Status,Candidate Name,Candidate Email,Application Date,Application Status,Candidate Skills\n";
-      
-      jobsWithApplications.forEach(job => {
-        if (job.applications.length === 0) {
-          csvContent += `"${job.title}","${job.skills_required}","${job.experience_years} years","${job.location || 'N/A'}","${job.salary_range || 'N/A'}","${new Date(job.created_at).toLocaleDateString()}","${job.status}","No applications","","","",""\n`;
-        } else {
-          job.applications.forEach(app => {
-            const candidateSkills = app.candidate_details?.profile?.skills ? app.candidate_details.profile.skills.join('; ') : 'N/A';
-            csvContent += `"${job.title}","${job.skills_required}","${job.experience_years} years","${job.location || 'N/A'}","${job.salary_range || 'N/A'}","${new Date(job.created_at).toLocaleDateString()}","${job.status}","${app.candidate_name}","${app.candidate_email}","${new Date(app.applied_at).toLocaleDateString()}","${app.status}","${candidateSkills}"\n`;
-          });
-        }
-      });
-
-      const blob = new Blob([csvContent], { type: 'text/csv' });
-      const url = URL.createObjectURL(blob);
-      const link = document.createElement('a');
-      link.href = url;
-      link.download = `recruitment-data-${user.company?.replace(/\s+/g, '-') || 'company'}-${new Date().toISOString().split('T')[0]}.csv`;
-      document.body.appendChild(link);
-      link.click();
-      document.body.removeChild(link);
-      URL.revokeObjectURL(url);
+      saveFile(
+        response.data,
+        'text/csv',
+        `recruitment-data-${user.company?.replace(/\s+/g, '-') || 'company'}-${new Date().toISOString().split('T')[0]}.csv`
+      );
 
       showMessage('success', 'CSV report downloaded successfully!');
     } catch (error) {
@@ -23,6 +23,22 @@ api.interceptors.request.use(
   }
 );
 
+// List endpoints return pages of { items, next_cursor }; the server caps each
+// page at MAX_PAGE_SIZE, so larger limits just mean fewer round trips.
+const PAGE_LIMIT = 100;
+
+// GET every page of a list endpoint; resolves to { data: [...all items] }
+export const getAll = async (url, config = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(url, { ...config, params: { ...config.params, limit: PAGE_LIMIT, cursor } });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return { data: items };
+};
+
 // Add response interceptor to handle auth errors
 api.interceptors.response.use(
   (response) => {